@@ -160,14 +160,17 @@ class AEAD(ABC):
             mac_xor_cipher1 = self.cipher1[:self.t]
 
             # append MAC
-            if isinstance(output_data, np.ndarray):
-                result = np.zeros((len(output_data) + len(mac_xor_cipher1)), dtype=np.uint8)
-                result[:len(output_data)] = output_data[:]
-                result[len(output_data):] = mac_xor_cipher1[:]
-                return result
-            elif isinstance(output_data, str):
+            if isinstance(output_data, str):
                 return output_data + Utility.convert_to_str(mac_xor_cipher1)
 
+            _output_data = Utility.convert_to_numpy(output_data)
+            result = np.zeros((len(_output_data) + len(mac_xor_cipher1)), dtype=np.uint8)
+            result[:len(_output_data)] = _output_data[:]
+            result[len(_output_data):] = mac_xor_cipher1[:]
+
+            # return output in same format as input
+            return Utility.convert_to_type(result, output_data)
+
         return output_data
 
     def decrypt_verify(
@@ -181,10 +184,10 @@ class AEAD(ABC):
             if mac is not None:
                 _input_data = input_data
                 _mac_to_verify = mac
-                if isinstance(mac, str):
-                    _mac_to_verify = Utility.copy_to_numpy(_mac_to_verify)
+                if not isinstance(mac, np.ndarray):
+                    _mac_to_verify = Utility.convert_to_numpy(_mac_to_verify)
             else:
-                _input_data = Utility.copy_to_numpy(input_data)
+                _input_data = Utility.convert_to_numpy(input_data)
                 _mac_to_verify = _input_data[-self.t:]
                 _input_data = _input_data[:-self.t]
         else:
@@ -213,7 +216,8 @@ class AEAD(ABC):
             if np.any(_mac_to_verify != self.cipher1[:self.t]):
                 raise ValueError("MAC is INVALID")
 
-            if isinstance(input_data, str) and isinstance(output_data, np.ndarray):
-                return Utility.convert_to_str(output_data)
+            # return output in same format as input
+            if isinstance(output_data, np.ndarray):
+                return Utility.convert_to_type(output_data, input_data)
 
         return output_data
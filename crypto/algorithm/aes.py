@@ -2,7 +2,8 @@
 from enum import IntEnum
 
 # from import internal library
-from rijndael import Rijndael, RijndaelBlockSize
+from rijndael import Rijndael, RijndaelBlockSize, RijndaelEngine
+from key_schedule_cache import key_schedule_cache
 
 
 class AESKeySize(IntEnum):
@@ -14,8 +15,8 @@ class AESKeySize(IntEnum):
 class AES(Rijndael):
     KEY_SHIFT = (1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1)
 
-    def __init__(self):
-        super(AES, self).__init__(block_size=RijndaelBlockSize.RIJNDAEL_128_BIT_BLOCK)
+    def __init__(self, engine: RijndaelEngine = RijndaelEngine.T_TABLE):
+        super(AES, self).__init__(block_size=RijndaelBlockSize.RIJNDAEL_128_BIT_BLOCK, engine=engine)
 
     def _validate_block_size(self):
         if self._block_size != 16:
@@ -29,6 +30,9 @@ class AES(Rijndael):
 
 
 if __name__ == '__main__':
+    import numpy as np
+    from utility import Utility
+
     # refer: https://www.simplilearn.com/tutorials/cryptography-tutorial/aes-encryption#:~:text=
     # The%20AES%20Encryption%20algorithm%20(also,together%20to%20form%20the%20ciphertext.
     _key = '5468617473206D79204B756E67204675'
@@ -47,3 +51,49 @@ if __name__ == '__main__':
     print(f'Plaintext {_output_data}')
     if _output_data != _input_data:
         raise RuntimeError('AES decryption fails')
+
+    print('Scenario 2: Reference engine')
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    aes = AES(engine=RijndaelEngine.REFERENCE)
+    aes.set_key(_key)
+    _output_data = aes.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != '29C3505F571420F6402299B31A02D73A':
+        raise RuntimeError('AES encryption fails')
+
+    _output_data = aes.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('AES decryption fails')
+
+    print('Scenario 3: Key schedule cache')
+    key_schedule_cache.purge()
+    key_schedule_cache.reset_statistics()
+    aes = AES()
+    aes.set_key(_key)
+    aes_other = AES()
+    aes_other.set_key(_key)
+    print(f'Statistics {key_schedule_cache.get_statistics()}')
+    if key_schedule_cache.get_statistics()['hits'] != 1 or aes_other.encrypt(_input_data) != '29C3505F571420F6402299B31A02D73A':
+        raise RuntimeError('AES key schedule cache fails')
+
+    key_schedule_cache.purge(_key)
+    if key_schedule_cache.get_statistics()['size'] != 0:
+        raise RuntimeError('AES key schedule cache purge fails')
+
+    print('Scenario 4: Encrypt into caller supplied block')
+    aes = AES()
+    aes.set_key(_key)
+    _in_block = Utility.copy_to_numpy(_input_data)
+    _out_block = np.zeros((16,), dtype=np.uint8)
+    aes.encrypt_into(_in_block, _out_block)
+    print(f'Ciphertext {Utility.convert_to_str(_out_block)}')
+    if Utility.convert_to_str(_out_block) != '29C3505F571420F6402299B31A02D73A' or \
+            Utility.convert_to_str(_in_block) != _input_data:
+        raise RuntimeError('AES encryption fails')
+
+    aes.decrypt_into(_out_block, _out_block)
+    print(f'Plaintext {Utility.convert_to_str(_out_block)}')
+    if Utility.convert_to_str(_out_block) != _input_data:
+        raise RuntimeError('AES decryption fails')
@@ -26,3 +26,39 @@ class Bitwise:
             raise NotImplementedError('Yet to be implemented... Sorry for the inconvenience')
         elif isinstance(a, np.ndarray):
             return np.bitwise_xor(a, b, out=out)
+
+    @staticmethod
+    def create_permutation_table(table: Tuple[int, ...], no_of_bits: int) -> Tuple[Tuple[int, ...], ...]:
+        # table lists the 1-based input bit position (from the most significant bit) of each output bit,
+        # the returned table holds, for each input byte, the permuted bits of all of its 256 values
+        # so that a permutation is the OR of one lookup per input byte
+        no_of_out_bits = len(table)
+        permutation_table = []
+
+        for i in range(no_of_bits >> 3):
+            # output bits of each bit of ith byte, starting from the most significant bit
+            bit_out = [0] * 8
+            for j, position in enumerate(table):
+                if (position - 1) >> 3 == i:
+                    bit_out[(position - 1) & 7] |= 1 << (no_of_out_bits - 1 - j)
+
+            # each value is its value without the least significant set bit, and the output of that bit
+            entries = [0] * 256
+            for value in range(1, 256):
+                lsb = value & -value
+                entries[value] = entries[value ^ lsb] | bit_out[8 - lsb.bit_length()]
+
+            permutation_table.append(tuple(entries))
+
+        return tuple(permutation_table)
+
+    @staticmethod
+    def permute(value: int, permutation_table: Tuple[Tuple[int, ...], ...]) -> int:
+        # apply the permutation created by create_permutation_table
+        out = 0
+        shift = len(permutation_table) << 3
+        for entries in permutation_table:
+            shift -= 8
+            out |= entries[(value >> shift) & 0xFF]
+
+        return out
@@ -1,18 +1,29 @@
 # import external library
+import math
+import mmap
 import numpy as np
+import os
+import warnings
 
 # from import external library
-from typing import Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import BinaryIO, Optional, Union
 
 # from import internal library
 from bitwise import Bitwise
 from block_cipher_modes import SymmetricAlgorithm, \
     BlockCipherConfidentialityModes, BlockCipherModesOfOperation
+from block_cipher_stream import BlockCipherStream
+from keystream import Keystream
 from padding import Padding, PaddingScheme
 from utility import Utility
 
 
 class BlockCipher:
+    # maximum number of blocks decrypted at once by parallel CBC and CFB decryption, to bound the memory
+    _PARALLEL_CHUNK_BLOCKS = 1 << 16
+
     def __init__(
             self,
             algorithm: SymmetricAlgorithm,
@@ -22,10 +33,15 @@ class BlockCipher:
     ):
         # create an algorithm instance
         SymmetricAlgorithm(algorithm)
+        self._algorithm = algorithm
         self.algorithm = algorithm.value()
         self._block_size = self.algorithm.get_block_size()
         self.encrypt_one_block = self.algorithm.get_encrypt_method()
         self.decrypt_one_block = self.algorithm.get_decrypt_method()
+        self.encrypt_into = self.algorithm.encrypt_into
+        self.decrypt_into = self.algorithm.decrypt_into
+        self.encrypt_blocks = self.algorithm.encrypt_blocks
+        self.decrypt_blocks = self.algorithm.decrypt_blocks
 
         # verify and store mode
         BlockCipherConfidentialityModes(mode)
@@ -52,6 +68,11 @@ class BlockCipher:
         # working numpy buffer
         self.src_temp = np.zeros((self._block_size,), dtype=np.uint8)
 
+        # parallel mode is disabled by default, see set_parallel
+        self._no_of_processes = 0
+        self._parallel_min_blocks = 0
+        self._pool = None
+
     def _increment_iv(self):
         # get last index
         i = len(self._iv) - 1
@@ -96,174 +117,441 @@ class BlockCipher:
             # add 1
             self._iv[i] += 1
 
-    def set_key(self, key: Union[str, np.ndarray]):
-        self.algorithm.set_key(key)
-
-    def set_iv(self, iv: Union[str, np.ndarray]):
-        # store iv
-        self.iv = iv
-
-        # store iv as numpy array
-        self._iv = Utility.copy_to_numpy(iv, error_msg='Invalid Initialization Vector')
-
-        # validate iv length
-        if self._block_size != len(self._iv):
-            raise ValueError(f'{self._iv} is not a valid block size')
-
-    def encrypt(
-            self,
-            input_data: Union[str, np.ndarray],
-            output_data: np.ndarray = None,
-            final: bool = False
-    ) -> Union[str, np.ndarray]:
-        # copy input to output for further calculation
-        _output_data = Utility.copy_to_numpy(input_data, out_data=output_data, error_msg='Invalid plaintext')
-
-        # append padding in final call
-        if final:
-            end_index = len(_output_data)
-            _output_data = self.padding.apply_padding(_output_data)
+    def _get_counter_block(self, offset: int) -> np.ndarray:
+        # counter block which is offset blocks after iv, i.e., iv + offset modulo 2^s,
+        # where s is all bits of block for CTR and last 32 bits for GCTR
+        iv = int.from_bytes(self._iv.tobytes(), 'big')
+        if self.mode == BlockCipherConfidentialityModes.CTR:
+            iv = (iv + offset) & ((1 << (self._block_size * 8)) - 1)
         else:
-            _output_data = _output_data
-            end_index = len(_output_data)
-
-        if len(_output_data) % self._block_size:
-            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes).'
-                             'Padding will only be handled in final call')
-
-        if self.is_chaining and self._iv is None:
-            raise ValueError('IV is not set')
-
-        # calculate number of complete blocks
-        no_of_blocks = len(_output_data) // self._block_size
+            iv = (iv & ~0xFFFFFFFF) | ((iv + offset) & 0xFFFFFFFF)
+
+        return np.frombuffer(iv.to_bytes(self._block_size, 'big'), dtype=np.uint8)
+
+    def _generate_counter_blocks(self, no_of_blocks: int) -> np.ndarray:
+        # successive counter blocks are iv + i for i = 0, 1, ..., N - 1 modulo 2^s, where s is all bits
+        # of block for CTR and last 32 bits for GCTR; all N blocks are computed at once on last 64 bits
+        # of block, where carry into the preceding bytes (CTR only) happens at most once
+        counter_blocks = np.empty((no_of_blocks, self._block_size), dtype=np.uint8)
+        counter_blocks[:] = self._iv
+
+        iv = int.from_bytes(self._iv.tobytes(), 'big')
+        low = iv & 0xFFFFFFFFFFFFFFFF
+        index = np.arange(no_of_blocks, dtype=np.uint64)
+
+        if self.mode == BlockCipherConfidentialityModes.CTR:
+            # uint64 array arithmetic wraps around modulo 2^64
+            counters = np.uint64(low) + index
+            size = self._block_size - 8
+            if size > 0:
+                carry = counters < np.uint64(low)
+                if carry.any():
+                    high = ((iv >> 64) + 1) & ((1 << (size * 8)) - 1)
+                    counter_blocks[carry, :size] = np.frombuffer(high.to_bytes(size, 'big'), dtype=np.uint8)
 
-        # process each block
+        else:
+            # increment last 32 bits only, i.e., with 32-bit wraparound
+            counters = ((np.uint64(low & 0xFFFFFFFF) + index) & np.uint64(0xFFFFFFFF)) | np.uint64(low & ~0xFFFFFFFF)
+
+        counter_blocks[:, -8:] = counters.astype('>u8').view(np.uint8).reshape(no_of_blocks, 8)
+        self._iv[:] = self._get_counter_block(no_of_blocks)
+
+        return counter_blocks
+
+    def _process_counter_mode(self, data: np.ndarray, no_of_blocks: int):
+        # encrypt all counter blocks at once and xor the keystream with data
+        keystream = self.encrypt_blocks(self._generate_counter_blocks(no_of_blocks))
+        Bitwise.xor(data, keystream.reshape(-1), data)
+
+    def _process_parallel_decryption(self, data: np.ndarray, no_of_blocks: int):
+        # each plaintext block depends only on its own and previous ciphertext block, so for CBC decrypt
+        # ciphertext blocks and for CFB encrypt ciphertext blocks shifted by one block, at once, and xor
+        # with ciphertext blocks shifted by one block and ciphertext blocks respectively; blocks are
+        # processed in chunks to bound the memory of shifted copy, and iv is the last ciphertext block
+        # of chunk so that next chunk and next call are chained
+        blocks = data.reshape(no_of_blocks, self._block_size)
+        for start in range(0, no_of_blocks, self._PARALLEL_CHUNK_BLOCKS):
+            chunk = blocks[start: start + self._PARALLEL_CHUNK_BLOCKS]
+            chaining_blocks = np.empty_like(chunk)
+            chaining_blocks[0] = self._iv
+            chaining_blocks[1:] = chunk[:-1]
+            self._iv[:] = chunk[-1]
+
+            if self.mode == BlockCipherConfidentialityModes.CBC:
+                self.decrypt_blocks(chunk)
+            else:
+                self.encrypt_blocks(chaining_blocks)
+
+            Bitwise.xor(chunk, chaining_blocks, chunk)
+
+    def set_parallel(self, no_of_processes: Optional[int] = None, min_blocks: int = 1 << 14):
+        # enable parallel ECB, CTR and GCTR for inputs of at least min_blocks blocks, using a pool of
+        # no_of_processes worker processes (all cpus if None), or disable if no_of_processes is 0
+        self.close()
+        if no_of_processes is None:
+            no_of_processes = os.cpu_count() or 1
+
+        if no_of_processes < 0 or min_blocks < 1:
+            raise ValueError(f'{no_of_processes} processes and {min_blocks} blocks are not valid for parallel mode')
+
+        self._no_of_processes = no_of_processes
+        self._parallel_min_blocks = min_blocks
+
+    def close(self):
+        # shutdown worker processes of parallel mode, if any
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _is_parallel(self, no_of_blocks: int) -> bool:
+        return self._no_of_processes > 1 and no_of_blocks >= self._parallel_min_blocks
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # worker processes are created on first use, and keyed once with the current key
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._no_of_processes,
+                initializer=_initialize_worker,
+                initargs=(
+                    self._algorithm, self.mode,
+                    self.algorithm.get_engine() if hasattr(self.algorithm, 'get_engine') else None,
+                    np.array(self.algorithm._key)
+                )
+            )
+
+        return self._pool
+
+    def _process_parallel(self, data: np.ndarray, no_of_blocks: int, encrypt: bool):
+        # place data in shared memory and let each worker process a block aligned range in place,
+        # where each range of counter mode starts from its own counter block
+        pool = self._get_pool()
+        memory = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            buffer = np.ndarray(data.shape, dtype=np.uint8, buffer=memory.buf)
+            buffer[:] = data
+
+            step = -(-no_of_blocks // self._no_of_processes)
+            futures = [
+                pool.submit(
+                    _process_range, memory.name, len(data), self._block_size, start, min(start + step, no_of_blocks),
+                    None if self.mode == BlockCipherConfidentialityModes.ECB else self._get_counter_block(start), encrypt
+                ) for start in range(0, no_of_blocks, step)
+            ]
+            for future in futures:
+                future.result()
+
+            data[:] = buffer
+            del buffer
+        finally:
+            memory.close()
+            memory.unlink()
+
+        # counter state for next call
+        if self.mode != BlockCipherConfidentialityModes.ECB:
+            self._iv[:] = self._get_counter_block(no_of_blocks)
+
+    def _process_encryption(self, data: np.ndarray, no_of_blocks: int):
+        # encrypt no_of_blocks complete blocks of data in place, advancing iv
+        # blocks are independent of each other, so process all blocks at once
+        if self._is_parallel(no_of_blocks) and \
+                self.mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CTR,
+                              BlockCipherConfidentialityModes.GCTR):
+            self._process_parallel(data, no_of_blocks, encrypt=True)
+            no_of_blocks = 0
+        elif self.mode == BlockCipherConfidentialityModes.ECB:
+            self.encrypt_blocks(data.reshape(no_of_blocks, self._block_size))
+            no_of_blocks = 0
+        elif self.mode in (BlockCipherConfidentialityModes.CTR, BlockCipherConfidentialityModes.GCTR):
+            self._process_counter_mode(data, no_of_blocks)
+            no_of_blocks = 0
+
+        # process each block, where each block is a view of output and
+        # is encrypted into itself or into the working buffer without allocation
         for i in range(no_of_blocks):
             _start = i * self._block_size
-            _end = _start + self._block_size
+            _block = data[_start: _start + self._block_size]
 
             if self.is_chaining:
-                if self.stream_cipher:
-                    self.src_temp[:] = self._iv[:]
-                elif self.block_cipher:
-                    self.src_temp[:] = _output_data[_start: _end]
-                    Bitwise.xor(self.src_temp, self._iv, self.src_temp)
+                if self.mode == BlockCipherConfidentialityModes.CBC:
+                    Bitwise.xor(_block, self._iv, _block)
+                    self.encrypt_into(_block, _block)
+                    self._iv[:] = _block
+                elif self.stream_cipher:
+                    self.encrypt_into(self._iv, self.src_temp)
+                    Bitwise.xor(self.src_temp, _block, _block)
+
+                    if self.mode == BlockCipherConfidentialityModes.OFB:
+                        self._iv[:] = self.src_temp[:]
+                    elif self.mode == BlockCipherConfidentialityModes.CFB:
+                        self._iv[:] = _block
+                    elif self.mode == BlockCipherConfidentialityModes.CTR:
+                        self._increment_iv()
+                    elif self.mode == BlockCipherConfidentialityModes.GCTR:
+                        self._increment_s_bits_of_iv(32)
+                    else:
+                        pass
                 else:
                     pass
             else:
-                self.src_temp[:] = _output_data[_start: _end]
-
-            self.encrypt_one_block(self.src_temp)
+                self.encrypt_into(_block, _block)
+
+    def _process_decryption(self, data: np.ndarray, no_of_blocks: int):
+        # decrypt no_of_blocks complete blocks of data in place, advancing iv
+        # blocks are independent of each other, so process all blocks at once
+        if self._is_parallel(no_of_blocks) and \
+                self.mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CTR,
+                              BlockCipherConfidentialityModes.GCTR):
+            self._process_parallel(data, no_of_blocks, encrypt=False)
+            no_of_blocks = 0
+        elif self.mode == BlockCipherConfidentialityModes.ECB:
+            self.decrypt_blocks(data.reshape(no_of_blocks, self._block_size))
+            no_of_blocks = 0
+        elif self.mode in (BlockCipherConfidentialityModes.CBC, BlockCipherConfidentialityModes.CFB):
+            # ciphertext blocks are known, so no serial dependency in decryption
+            self._process_parallel_decryption(data, no_of_blocks)
+            no_of_blocks = 0
+        elif self.mode in (BlockCipherConfidentialityModes.CTR, BlockCipherConfidentialityModes.GCTR):
+            self._process_counter_mode(data, no_of_blocks)
+            no_of_blocks = 0
+
+        # process each block, where each block is a view of output and
+        # is decrypted into itself or into the working buffer without allocation
+        for i in range(no_of_blocks):
+            _start = i * self._block_size
+            _block = data[_start: _start + self._block_size]
 
             if self.is_chaining:
                 if self.mode == BlockCipherConfidentialityModes.CBC:
-                    _output_data[_start: _end] = self.src_temp[:]
-                    self._iv[:] = _output_data[_start: _end]
+                    self.decrypt_into(_block, self.src_temp)
+                    Bitwise.xor(self.src_temp, self._iv, self.src_temp)
+                    self._iv[:] = _block
+                    _block[:] = self.src_temp
                 elif self.stream_cipher:
-                    Bitwise.xor(self.src_temp[:], _output_data[_start: _end], _output_data[_start: _end])
+                    self.encrypt_into(self._iv, self.src_temp)
 
                     if self.mode == BlockCipherConfidentialityModes.OFB:
                         self._iv[:] = self.src_temp[:]
                     elif self.mode == BlockCipherConfidentialityModes.CFB:
-                        self._iv[:] = _output_data[_start: _end]
+                        self._iv[:] = _block
                     elif self.mode == BlockCipherConfidentialityModes.CTR:
                         self._increment_iv()
                     elif self.mode == BlockCipherConfidentialityModes.GCTR:
                         self._increment_s_bits_of_iv(32)
                     else:
                         pass
+                    Bitwise.xor(self.src_temp, _block, _block)
                 else:
                     pass
             else:
-                _output_data[_start: _end] = self.src_temp[:]
+                self.decrypt_into(_block, _block)
+
+    def get_keystream(self, budget: int = 1 << 16) -> Keystream:
+        # keystream of OFB, CTR or GCTR mode, which can be generated ahead of time up to budget bytes
+        return Keystream(self, budget=budget)
+
+    def _process_in_place(self, data: np.ndarray, encrypt: bool):
+        # process complete blocks of data in place, and last partial block of stream modes
+        # as a complete block which is truncated, i.e., without padding
+        _process = self._process_encryption if encrypt else self._process_decryption
+        no_of_blocks = len(data) // self._block_size
+        _process(data[:no_of_blocks * self._block_size], no_of_blocks)
+
+        remaining = len(data) - no_of_blocks * self._block_size
+        if remaining:
+            _block = np.zeros((self._block_size,), dtype=np.uint8)
+            _block[:remaining] = data[-remaining:]
+            _process(_block, 1)
+            data[-remaining:] = _block[:remaining]
+
+    def get_encryptor(self) -> BlockCipherStream:
+        # incremental encryption of data of any length, see BlockCipherStream.update and finalize
+        return BlockCipherStream(self, encrypt=True)
+
+    def get_decryptor(self) -> BlockCipherStream:
+        # incremental decryption of data of any length, see BlockCipherStream.update and finalize
+        return BlockCipherStream(self, encrypt=False)
+
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = 1 << 20) -> int:
+        # encrypt file-like src into dst with bounded memory, and padding applied at the end
+        return self.get_encryptor().process(src, dst, chunk_size=chunk_size)
+
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = 1 << 20) -> int:
+        # decrypt file-like src into dst with bounded memory, and padding removed at the end
+        return self.get_decryptor().process(src, dst, chunk_size=chunk_size)
+
+    def _process_file(self, path: str, offset: int, length: Optional[int], window_size: int, encrypt: bool) -> int:
+        # output length must be same as input length, i.e., no padding, so only ECB and CBC of complete blocks,
+        # and stream modes of any length can be processed in place
+        if self.mode == BlockCipherConfidentialityModes.PCBC:
+            raise ValueError(f'{self.mode.name} is not a valid mode for in place processing')
 
-        if final and self.stream_cipher:
-            if output_data is not None:
-                output_data[:] = _output_data[:end_index]
+        if self.is_chaining and self._iv is None:
+            raise ValueError('IV is not set')
 
-        # return output in same format as input
-        if isinstance(input_data, str):
-            return Utility.convert_to_str(_output_data[:end_index])
+        file_size = os.path.getsize(path)
+        if length is None:
+            length = file_size - offset
+        if offset < 0 or length < 0 or offset + length > file_size:
+            raise ValueError(f'{offset}, {length} is not a valid region of {file_size} bytes')
 
-        return _output_data[:end_index]
+        if not self.stream_cipher and length % self._block_size:
+            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
 
-    def decrypt(
+        if length == 0:
+            return 0
+
+        # windows are complete blocks and complete pages, so that pages of a processed window can be released
+        unit = mmap.PAGESIZE * self._block_size // math.gcd(mmap.PAGESIZE, self._block_size)
+        window_size = max(window_size // unit, 1) * unit
+
+        # offset of mapping must be multiple of allocation granularity
+        map_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+        start = offset - map_offset
+
+        with open(path, 'r+b') as f, mmap.mmap(f.fileno(), start + length, offset=map_offset) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+
+            for position in range(0, length, window_size):
+                # numpy view of window, without copy
+                window = np.frombuffer(mm, dtype=np.uint8, count=min(window_size, length - position),
+                                       offset=start + position)
+                self._process_in_place(window, encrypt)
+                del window
+
+                # release pages of processed window, which stay in page cache, to keep memory constant
+                if hasattr(mmap, 'MADV_DONTNEED'):
+                    page = (start + position) - (start + position) % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, page, min(start + position + window_size, len(mm)) - page)
+
+            mm.flush()
+
+        return length
+
+    def encrypt_file(self, path: str, offset: int = 0, length: Optional[int] = None, window_size: int = 1 << 24) -> int:
+        # encrypt length bytes (up to end of file if None) of file from offset in place through memory mapped
+        # windows of about window_size bytes, without padding; returns number of bytes encrypted
+        return self._process_file(path, offset, length, window_size, encrypt=True)
+
+    def decrypt_file(self, path: str, offset: int = 0, length: Optional[int] = None, window_size: int = 1 << 24) -> int:
+        # decrypt length bytes (up to end of file if None) of file from offset in place through memory mapped
+        # windows of about window_size bytes, without padding; returns number of bytes decrypted
+        return self._process_file(path, offset, length, window_size, encrypt=False)
+
+    def set_key(self, key: Union[str, np.ndarray]):
+        # workers of parallel mode are keyed with the previous key
+        self.close()
+        self.algorithm.set_key(key)
+
+    def set_iv(self, iv: Union[str, np.ndarray]):
+        # store iv
+        self.iv = iv
+
+        # store iv as numpy array
+        self._iv = Utility.copy_to_numpy(iv, error_msg='Invalid Initialization Vector')
+
+        # validate iv length
+        if self._block_size != len(self._iv):
+            raise ValueError(f'{self._iv} is not a valid block size')
+
+    def encrypt(
             self,
-            input_data: Union[str, np.ndarray],
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
             output_data: np.ndarray = None,
-            final: bool = False
-    ) -> Union[str, np.ndarray]:
-        # copy input to output for further calculation
-        _output_data = Utility.copy_to_numpy(input_data, out_data=output_data, error_msg='Invalid ciphertext')
-
-        end_index = len(_output_data)
-        if self.stream_cipher:
-            _output_data = Padding(PaddingScheme.M1, self._block_size).apply_padding(_output_data)
+            final: bool = False,
+            in_place: bool = False
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # copy input to output for further calculation, or process writable input in place
+        _output_data = Utility.copy_to_numpy(
+            input_data, out_data=output_data, error_msg='Invalid plaintext', in_place=in_place
+        )
+
+        # append padding in final call, where last partial block of stream modes is processed without padding,
+        # so that output is of padded length in block cipher modes and of input length in stream modes
+        if final and not self.stream_cipher:
+            _output_data = self.padding.apply_padding(_output_data)
 
-        # validate input data length
-        if len(_output_data) % self._block_size:
-            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
+        if len(_output_data) % self._block_size and not (final and self.stream_cipher):
+            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes).'
+                             'Padding will only be handled in final call')
 
         if self.is_chaining and self._iv is None:
             raise ValueError('IV is not set')
 
-        # calculate number of complete blocks
-        no_of_blocks = len(_output_data) // self._block_size
+        self._process_in_place(_output_data, encrypt=True)
 
-        # process each block
-        for i in range(no_of_blocks):
-            _start = i * self._block_size
-            _end = _start + self._block_size
+        # return output in same format as input
+        return Utility.convert_to_type(_output_data, input_data)
 
-            if self.is_chaining:
-                if self.stream_cipher:
-                    self.src_temp[:] = self._iv[:]
-                elif self.block_cipher:
-                    self.src_temp[:] = _output_data[_start: _end]
-                else:
-                    pass
-            else:
-                self.src_temp[:] = _output_data[_start: _end]
+    def decrypt(
+            self,
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+            output_data: np.ndarray = None,
+            final: bool = False,
+            in_place: bool = False
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # copy input to output for further calculation, or process writable input in place
+        _output_data = Utility.copy_to_numpy(
+            input_data, out_data=output_data, error_msg='Invalid ciphertext', in_place=in_place
+        )
+
+        # validate input data length, where last partial block of stream modes is processed without padding
+        if len(_output_data) % self._block_size and not self.stream_cipher:
+            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
 
-            if self.stream_cipher:
-                self.encrypt_one_block(self.src_temp)
-            else:
-                self.decrypt_one_block(self.src_temp)
+        if self.is_chaining and self._iv is None:
+            raise ValueError('IV is not set')
 
-            if self.is_chaining:
-                if self.mode == BlockCipherConfidentialityModes.CBC:
-                    Bitwise.xor(self.src_temp, self._iv, self.src_temp)
-                    self._iv[:] = _output_data[_start: _end]
-                    _output_data[_start: _end] = self.src_temp[:]
-                elif self.stream_cipher:
-                    if self.mode == BlockCipherConfidentialityModes.OFB:
-                        self._iv[:] = self.src_temp[:]
-                    elif self.mode == BlockCipherConfidentialityModes.CFB:
-                        self._iv[:] = _output_data[_start: _end]
-                    elif self.mode == BlockCipherConfidentialityModes.CTR:
-                        self._increment_iv()
-                    elif self.mode == BlockCipherConfidentialityModes.GCTR:
-                        self._increment_s_bits_of_iv(32)
-                    else:
-                        pass
-                    Bitwise.xor(self.src_temp, _output_data[_start: _end], _output_data[_start: _end])
-                else:
-                    pass
-            else:
-                _output_data[_start: _end] = self.src_temp[:]
+        self._process_in_place(_output_data, encrypt=False)
 
-        # remove padding in final call
-        if final:
+        # remove padding in final call, where stream modes have no padding
+        if final and not self.stream_cipher:
             _output_data = self.padding.remove_padding(_output_data)
 
-        if output_data is not None:
-            output_data[:] = _output_data[:end_index]
+        # copy output in passed output data buffer, unless it is already there
+        if output_data is not None and not np.may_share_memory(_output_data, output_data):
+            output_data[:len(_output_data)] = _output_data
 
         # return output in same format as input
-        if isinstance(input_data, str):
-            return Utility.convert_to_str(_output_data[:end_index])
+        return Utility.convert_to_type(_output_data, input_data)
+
+
+# block cipher of worker process of parallel mode, keyed once by initializer of worker
+_worker_block_cipher = None
+
+
+def _initialize_worker(algorithm: SymmetricAlgorithm, mode: BlockCipherConfidentialityModes, engine, key: np.ndarray):
+    global _worker_block_cipher
+    _worker_block_cipher = BlockCipher(algorithm, mode)
+    if engine is not None:
+        _worker_block_cipher.algorithm.set_engine(engine)
 
-        return _output_data[:end_index]
+    # warnings of key are already raised by the caller
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        _worker_block_cipher.set_key(key)
+
+
+def _process_range(name: str, size: int, block_size: int, start: int, end: int, iv: Optional[np.ndarray], encrypt: bool):
+    # process blocks [start, end) of shared memory in place, where iv is the counter block of start block
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray((size,), dtype=np.uint8, buffer=memory.buf)[start * block_size: end * block_size]
+        if iv is None:
+            blocks = data.reshape(end - start, block_size)
+            if encrypt:
+                _worker_block_cipher.encrypt_blocks(blocks)
+            else:
+                _worker_block_cipher.decrypt_blocks(blocks)
+            del blocks
+        else:
+            _worker_block_cipher.set_iv(iv)
+            _worker_block_cipher._process_counter_mode(data, end - start)
+
+        # release the view before closing shared memory
+        del data
+    finally:
+        memory.close()
 
 
 if __name__ == '__main__':
@@ -388,3 +676,244 @@ if __name__ == '__main__':
     print(f'Plaintext {_output_data_}')
     if _output_data_ != _input_data:
         raise RuntimeError('AES decryption fails')
+
+    # AES, multiple blocks
+    from rijndael import RijndaelEngine
+    _input_data = Utility.generate_random(16 * 64)
+    print('=' * 80)
+    print('Scenario 4: AES, 64 blocks, compare with reference engine')
+    print(f'Key {_key}')
+    print(f'IV {_iv}')
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CBC,
+                  BlockCipherConfidentialityModes.CFB, BlockCipherConfidentialityModes.CTR,
+                  BlockCipherConfidentialityModes.GCTR):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.algorithm.set_engine(RijndaelEngine.REFERENCE)
+        aes.set_key(_key)
+        _expected_data = aes.encrypt(_input_data, final=True)
+
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+        _output_data_ = aes.encrypt(_input_data, final=True)
+        if _output_data_ != _expected_data:
+            raise RuntimeError('AES encryption fails')
+        aes.set_iv(_iv)
+        _output_data_ = aes.decrypt(_output_data_)
+        if _output_data_ != _input_data:
+            raise RuntimeError('AES decryption fails')
+        print('Passed')
+
+    # TDES, multiple blocks
+    from des import DESEngine
+    from warning_crypto import DeprecatedWarning, DisallowedWarning
+    _key = '133457799BBCDFF11557799BBCCDDFF1133457799BBCCDDF'
+    _iv = '0123456789ABCDEF'
+    _input_data = Utility.generate_random(8 * 128)
+    print('=' * 80)
+    print('Scenario 5: TDES, 128 blocks, compare with reference engine')
+    print(f'Key {_key}')
+    print(f'IV {_iv}')
+    warnings.filterwarnings("ignore", category=DeprecatedWarning)
+    warnings.filterwarnings("ignore", category=DisallowedWarning)
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CBC):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        tdes = BlockCipher(SymmetricAlgorithm.TDES, _mode, PaddingScheme.M1, _iv)
+        tdes.algorithm.set_engine(DESEngine.REFERENCE)
+        tdes.set_key(_key)
+        _expected_data = tdes.encrypt(_input_data, final=True)
+
+        tdes = BlockCipher(SymmetricAlgorithm.TDES, _mode, PaddingScheme.M1, _iv)
+        tdes.set_key(_key)
+        _output_data_ = tdes.encrypt(_input_data, final=True)
+        if _output_data_ != _expected_data:
+            raise RuntimeError('TDES encryption fails')
+        tdes.set_iv(_iv)
+        _output_data_ = tdes.decrypt(_output_data_, final=True)
+        if _output_data_ != _input_data:
+            raise RuntimeError('TDES decryption fails')
+        print('Passed')
+    warnings.resetwarnings()
+
+    # SEED, multiple blocks
+    from seed import SEEDEngine
+    _key = '88E34F8F081779F1E9F394370AD40589'
+    _iv = '26D5B43B5A4B3F4A1A9F0D6E4C7B2E11'
+    _input_data = Utility.generate_random(16 * 128)
+    print('=' * 80)
+    print('Scenario 6: SEED, 128 blocks, compare with reference engine')
+    print(f'Key {_key}')
+    print(f'IV {_iv}')
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CBC,
+                  BlockCipherConfidentialityModes.CFB, BlockCipherConfidentialityModes.CTR):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        seed = BlockCipher(SymmetricAlgorithm.SEED, _mode, PaddingScheme.M1, _iv)
+        seed.algorithm.set_engine(SEEDEngine.REFERENCE)
+        seed.set_key(_key)
+        _expected_data = seed.encrypt(_input_data, final=True)
+
+        seed = BlockCipher(SymmetricAlgorithm.SEED, _mode, PaddingScheme.M1, _iv)
+        seed.set_key(_key)
+        _output_data_ = seed.encrypt(_input_data, final=True)
+        if _output_data_ != _expected_data:
+            raise RuntimeError('SEED encryption fails')
+        seed.set_iv(_iv)
+        _output_data_ = seed.decrypt(_output_data_, final=True)
+        if _output_data_ != _input_data:
+            raise RuntimeError('SEED decryption fails')
+        print('Passed')
+
+    # AES, counter blocks across carry, compare with encryption of counters computed on python int
+    _key = '2B7E151628AED2A6ABF7158809CF4F3C'
+    _input_data = Utility.generate_random(16 * 4)
+    print('=' * 80)
+    print('Scenario 7: AES, counter wraparound')
+    for _mode, _iv in ((BlockCipherConfidentialityModes.CTR, '00000000000000FFFFFFFFFFFFFFFFFE'),
+                       (BlockCipherConfidentialityModes.GCTR, '000000000000000000000000FFFFFFFE')):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        print(f'IV {_iv}')
+        _counter = int(_iv, 16)
+        _mask = (1 << 128) - 1 if _mode == BlockCipherConfidentialityModes.CTR else 0xFFFFFFFF
+        _counters = ''.join(
+            f'{(_counter & ~_mask) | ((_counter + _i) & _mask):032X}' for _i in range(4)
+        )
+        aes = BlockCipher(SymmetricAlgorithm.AES, BlockCipherConfidentialityModes.ECB, PaddingScheme.M1)
+        aes.set_key(_key)
+        _keystream = aes.encrypt(_counters)
+        _expected_data = f'{int(_keystream, 16) ^ int(_input_data, 16):0128X}'
+
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+        _output_data_ = aes.encrypt(_input_data[:64]) + aes.encrypt(_input_data[64:], final=True)
+        if _output_data_ != _expected_data:
+            raise RuntimeError('AES encryption fails')
+        print('Passed')
+
+    # AES, parallel mode, compare with single process
+    _key = '2B7E151628AED2A6ABF7158809CF4F3C'
+    _iv = '000000000000000000000000FFFFFFF0'
+    _input_data = Utility.generate_random(16 * 64)
+    print('=' * 80)
+    print('Scenario 8: AES, 64 blocks, parallel mode')
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CTR,
+                  BlockCipherConfidentialityModes.GCTR):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+        _expected_data = aes.encrypt(_input_data[:512]) + aes.encrypt(_input_data[512:], final=True)
+
+        aes_parallel = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes_parallel.set_key(_key)
+        aes_parallel.set_parallel(no_of_processes=2, min_blocks=16)
+        _output_data_ = aes_parallel.encrypt(_input_data[:512]) + aes_parallel.encrypt(_input_data[512:], final=True)
+        if _output_data_ != _expected_data or (_mode != BlockCipherConfidentialityModes.ECB and
+                                               not np.array_equal(aes_parallel._iv, aes._iv)):
+            raise RuntimeError('AES encryption fails')
+        aes_parallel.set_iv(_iv)
+        _output_data_ = aes_parallel.decrypt(_output_data_, final=True)
+        aes_parallel.close()
+        if _output_data_ != _input_data:
+            raise RuntimeError('AES decryption fails')
+        print('Passed')
+
+    print('=' * 80)
+    print('Scenario 9: AES, in place file encryption')
+    import tempfile
+    _file_data = bytes.fromhex(_input_data) * 3
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CBC,
+                  BlockCipherConfidentialityModes.OFB, BlockCipherConfidentialityModes.CFB,
+                  BlockCipherConfidentialityModes.CTR, BlockCipherConfidentialityModes.GCTR):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+
+        # region from offset 5 of length not multiple of block length for stream modes
+        _length = len(_file_data) - 21 if aes.stream_cipher else len(_file_data) - 16
+        _expected_data = aes.encrypt(_file_data[5: 5 + _length].hex().upper(), final=True)
+
+        with tempfile.TemporaryDirectory() as _directory:
+            _path = os.path.join(_directory, 'data')
+            with open(_path, 'wb') as _file:
+                _file.write(_file_data)
+
+            aes.set_iv(_iv)
+            if aes.encrypt_file(_path, offset=5, length=_length, window_size=1) != _length:
+                raise RuntimeError('AES encryption fails')
+            with open(_path, 'rb') as _file:
+                _output_data_ = _file.read()
+            if _output_data_[5: 5 + _length].hex().upper() != _expected_data or \
+                    _output_data_[:5] != _file_data[:5] or _output_data_[5 + _length:] != _file_data[5 + _length:]:
+                raise RuntimeError('AES encryption fails')
+
+            aes.set_iv(_iv)
+            aes.decrypt_file(_path, offset=5, length=_length)
+            with open(_path, 'rb') as _file:
+                if _file.read() != _file_data:
+                    raise RuntimeError('AES decryption fails')
+        print('Passed')
+
+    print('=' * 80)
+    print('Scenario 10: AES, buffer protocol inputs')
+    for _mode in (BlockCipherConfidentialityModes.CBC, BlockCipherConfidentialityModes.CTR):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+        _expected_data = aes.encrypt(_input_data, final=True)
+
+        # bytes is returned as bytes, and memoryview as memoryview without touching input
+        aes.set_iv(_iv)
+        _output_data_ = aes.encrypt(bytes.fromhex(_input_data), final=True)
+        if not isinstance(_output_data_, bytes) or _output_data_.hex().upper() != _expected_data:
+            raise RuntimeError('AES encryption fails')
+
+        aes.set_iv(_iv)
+        _buffer = bytearray.fromhex(_input_data)
+        _output_data_ = aes.encrypt(memoryview(_buffer), final=True)
+        if not isinstance(_output_data_, memoryview) or bytes(_output_data_).hex().upper() != _expected_data or \
+                _buffer.hex().upper() != _input_data:
+            raise RuntimeError('AES encryption fails')
+
+        # bytearray is processed in place and returned as is
+        aes.set_iv(_iv)
+        if aes.decrypt(_output_data_, final=True, in_place=True) is not _output_data_ or \
+                bytes(_output_data_).hex().upper() != _input_data:
+            raise RuntimeError('AES decryption fails')
+
+        aes.set_iv(_iv)
+        if aes.encrypt(_buffer, final=True, in_place=True) is not _buffer or _buffer.hex().upper() != _expected_data:
+            raise RuntimeError('AES encryption fails')
+        print('Passed')
+
+    print('=' * 80)
+    print('Scenario 11: AES, padding in final call')
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CBC,
+                  BlockCipherConfidentialityModes.OFB, BlockCipherConfidentialityModes.CTR):
+        print('-' * 80)
+        print(f'Mode : {_mode.name}')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.PKCS, _iv)
+        aes.set_key(_key)
+        for _length in (0, 5, 16, 21):
+            _input_data = '41' * _length
+
+            # block cipher modes always append padding, i.e., up to next multiple of block length,
+            # while stream modes keep input length
+            aes.set_iv(_iv)
+            _output_data_ = aes.encrypt(_input_data, final=True)
+            if aes.stream_cipher:
+                _expected_length = _length
+            else:
+                _expected_length = (_length // 16 + 1) * 16
+            if len(_output_data_) != _expected_length * 2:
+                raise RuntimeError('AES encryption fails')
+
+            aes.set_iv(_iv)
+            if aes.decrypt(_output_data_, final=True) != _input_data:
+                raise RuntimeError('AES decryption fails')
+        print('Passed')
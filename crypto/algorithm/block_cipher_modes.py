@@ -5,6 +5,7 @@ from enum import Enum, IntEnum
 from des import DES
 from tdes import TDES
 from aes import AES
+from seed import SEED
 
 
 class SymmetricAlgorithm(Enum):
@@ -17,6 +18,9 @@ class SymmetricAlgorithm(Enum):
     # instance of AES algorithm
     AES = AES
 
+    # instance of SEED algorithm
+    SEED = SEED
+
 
 class BlockCipherModesOfOperation(IntEnum):
     CONFIDENTIAL = 0xFF00
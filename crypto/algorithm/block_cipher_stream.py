@@ -0,0 +1,194 @@
+# import external library
+import numpy as np
+
+# from import external library
+from typing import BinaryIO, Union
+
+# from import internal library
+from utility import Utility
+
+
+class BlockCipherStream:
+    def __init__(self, block_cipher, encrypt: bool = True):
+        # incremental encryption or decryption of a keyed block cipher, where data of any length is passed to
+        # update and partial block is carried to next update; padding is handled only in finalize
+        if block_cipher.is_chaining and block_cipher._iv is None:
+            raise ValueError('IV is not set')
+
+        self._block_cipher = block_cipher
+        self._block_size = block_cipher._block_size
+        self._encrypt = encrypt
+
+        # last block of block cipher modes is held back in decryption, since padding is removed in finalize
+        self._hold_back = not encrypt and not block_cipher.stream_cipher
+
+        # carried bytes are tail[:tail_length], and next tail is saved before output is written
+        self._tail = np.zeros((self._block_size,), dtype=np.uint8)
+        self._next_tail = np.zeros((self._block_size,), dtype=np.uint8)
+        self._tail_length = 0
+
+    def _process(self, data: np.ndarray, no_of_blocks: int):
+        if self._encrypt:
+            self._block_cipher._process_encryption(data, no_of_blocks)
+        else:
+            self._block_cipher._process_decryption(data, no_of_blocks)
+
+    def update(
+            self,
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+            output_data: np.ndarray = None
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # process complete blocks of carried bytes followed by input, and carry the rest;
+        # input is only read, so it is used as is without copy
+        _input_data = Utility.convert_to_numpy(input_data, error_msg='Invalid data').reshape(-1)
+
+        tail_length = self._tail_length
+        total_length = tail_length + len(_input_data)
+        if self._hold_back:
+            no_of_blocks = max(total_length - 1, 0) // self._block_size
+        else:
+            no_of_blocks = total_length // self._block_size
+        length = no_of_blocks * self._block_size
+
+        if output_data is None:
+            _output_data = np.zeros((length,), dtype=np.uint8)
+        elif len(output_data) < length:
+            raise ValueError(f'Output data is shorter than {length} bytes')
+        else:
+            _output_data = output_data[:length]
+
+        if length == 0:
+            # everything fits in the tail
+            self._tail[tail_length: total_length] = _input_data
+            self._tail_length = total_length
+        else:
+            # save the new tail first, as output may overlap input
+            next_tail_length = total_length - length
+            self._next_tail[:next_tail_length] = _input_data[len(_input_data) - next_tail_length:]
+
+            _output_data[tail_length:] = _input_data[:length - tail_length]
+            _output_data[:tail_length] = self._tail[:tail_length]
+            self._process(_output_data, no_of_blocks)
+
+            self._tail, self._next_tail = self._next_tail, self._tail
+            self._tail_length = next_tail_length
+
+        # return output in same format as input
+        return Utility.convert_to_type(_output_data, input_data)
+
+    def finalize(self, output_data: np.ndarray = None, as_str: bool = False) -> Union[str, np.ndarray]:
+        # process carried bytes, applying padding in encryption or removing it in decryption,
+        # and reset the carry so that the stream can be continued with the advanced iv
+        tail = self._tail[:self._tail_length]
+        self._tail_length = 0
+
+        if self._block_cipher.stream_cipher:
+            # last partial block is processed as a complete block and truncated, i.e., without padding
+            _output_data = self._block_cipher.padding.apply_m1(tail.copy())
+            self._process(_output_data, len(_output_data) // self._block_size)
+            _output_data = _output_data[:len(tail)]
+        elif self._encrypt:
+            _output_data = self._block_cipher.padding.apply_padding(tail.copy())
+            if len(_output_data) % self._block_size:
+                raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
+            self._process(_output_data, len(_output_data) // self._block_size)
+        else:
+            if len(tail) % self._block_size:
+                raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
+            _output_data = tail.copy()
+            self._process(_output_data, len(_output_data) // self._block_size)
+            if len(_output_data):
+                _output_data = self._block_cipher.padding.remove_padding(_output_data)
+
+        if output_data is not None:
+            if len(output_data) < len(_output_data):
+                raise ValueError(f'Output data is shorter than {len(_output_data)} bytes')
+            output_data[:len(_output_data)] = _output_data
+            _output_data = output_data[:len(_output_data)]
+
+        if as_str:
+            return Utility.convert_to_str(_output_data)
+
+        return _output_data
+
+    def process(self, src: BinaryIO, dst: BinaryIO, chunk_size: int = 1 << 20) -> int:
+        # process file-like src into dst chunk by chunk through preallocated buffers, so that memory is bounded
+        # by chunk size regardless of length of src; returns number of bytes written
+        if chunk_size <= 0:
+            raise ValueError(f'{chunk_size} is not a valid chunk size')
+
+        in_buffer = bytearray(chunk_size)
+        in_view = memoryview(in_buffer)
+        in_data = np.frombuffer(in_buffer, dtype=np.uint8)
+
+        # output of an update is at most carried bytes and a chunk, and output of finalize is at most a block
+        out_data = np.zeros((chunk_size + self._block_size,), dtype=np.uint8)
+
+        no_of_bytes = 0
+        while True:
+            length = src.readinto(in_view)
+            if not length:
+                break
+
+            _output_data = self.update(in_data[:length], out_data)
+            dst.write(_output_data.data)
+            no_of_bytes += len(_output_data)
+
+        _output_data = self.finalize(out_data)
+        dst.write(_output_data.data)
+        no_of_bytes += len(_output_data)
+
+        return no_of_bytes
+
+
+if __name__ == '__main__':
+    import io
+    from block_cipher import BlockCipher
+    from block_cipher_modes import BlockCipherConfidentialityModes, SymmetricAlgorithm
+    from padding import PaddingScheme
+
+    _key = '2B7E151628AED2A6ABF7158809CF4F3C'
+    _iv = '000102030405060708090A0B0C0D0E0F'
+    _input_data = bytes.fromhex(Utility.generate_random(1000))
+    for _mode in (BlockCipherConfidentialityModes.ECB, BlockCipherConfidentialityModes.CBC,
+                  BlockCipherConfidentialityModes.OFB, BlockCipherConfidentialityModes.CFB,
+                  BlockCipherConfidentialityModes.CTR, BlockCipherConfidentialityModes.GCTR):
+        print('=' * 80)
+        print(f'Scenario: AES, {_mode.name}, chunks of any length')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.PKCS, _iv)
+        aes.set_key(_key)
+
+        # expected output of one shot encryption, with padding applied in final call
+        _expected_data = aes.encrypt(np.frombuffer(_input_data, dtype=np.uint8), final=True)
+
+        # chunks of 1, 3, 5, ..., bytes
+        aes.set_iv(_iv)
+        stream = BlockCipherStream(aes)
+        _output_data, _start, _length = [], 0, 1
+        while _start < len(_input_data):
+            _output_data.append(stream.update(np.frombuffer(_input_data[_start: _start + _length], dtype=np.uint8)))
+            _start += _length
+            _length += 2
+        _output_data.append(stream.finalize())
+        _output_data = np.concatenate(_output_data)
+        if not np.array_equal(_output_data, _expected_data):
+            raise RuntimeError('Stream encryption fails')
+
+        # output of finalize is decrypted by one shot decryption, with padding removed in final call
+        aes.set_iv(_iv)
+        if aes.decrypt(_output_data, final=True).tobytes() != _input_data:
+            raise RuntimeError('Stream encryption fails')
+
+        # file-like objects, with chunk size not multiple of block size
+        aes.set_iv(_iv)
+        _dst = io.BytesIO()
+        if aes.encrypt_stream(io.BytesIO(_input_data), _dst, chunk_size=100) != len(_expected_data) or \
+                _dst.getvalue() != _expected_data.tobytes():
+            raise RuntimeError('Stream encryption fails')
+
+        aes.set_iv(_iv)
+        _src, _dst = io.BytesIO(_dst.getvalue()), io.BytesIO()
+        aes.decrypt_stream(_src, _dst, chunk_size=48)
+        if _dst.getvalue() != _input_data:
+            raise RuntimeError('Stream decryption fails')
+        print('Passed')
@@ -1,6 +1,7 @@
 # import external library
 import numpy as np
-# import warnings
+import struct
+import warnings
 
 # from import external library
 from abc import ABC
@@ -9,8 +10,8 @@ from typing import Tuple
 
 # from import internal library
 from bitwise import Bitwise
-from utility import Utility
 from feistel_cipher import FeistelCipher
+from warning_crypto import KeyParityWarning
 
 
 # from warning_crypto import WithdrawnWarning
@@ -24,79 +25,131 @@ class FEALXKeySize(IntEnum):
     FEAL_128_BIT_KEY = 16
 
 
+class FEALEngine(IntEnum):
+    # numpy based implementation
+    REFERENCE = 0
+
+    # python int based implementation on packed 32-bit words
+    INTEGER = 1
+
+
 class FEAL(FeistelCipher, ABC):
-    def __init__(self, no_of_rounds: int = 4, key_parity: bool = True):
+    # rot2 of sum of two bytes, indexed by sum without reduction modulo 256, i.e., S0(a, b) is _S[a + b]
+    # and S1(a, b) is _S[a + b + 1]
+    _S = tuple((((x << 2) | ((x & 0xFF) >> 6)) & 0xFF) for x in range(512))
+
+    # same as _S for vectorized lookups of multi-block implementation
+    _S_ARRAY = np.array(_S, dtype=np.uint32)
+
+    # minimum number of blocks for which multi-block implementation is faster than integer implementation
+    _VECTORIZED_MIN_BLOCKS = 32
+
+    # attributes calculated by key schedule, which are stored in key schedule cache
+    _KEY_SCHEDULE_ATTRIBUTES = ('_key_size', '_round_key', '_round_key_ints', '_i_round_key_ints')
+
+    # valid key sizes, i.e., 64-bit key of FEAL-N or 128-bit key of FEAL-NX
+    _KEY_SIZE = FEALKeySize
+
+    def __init__(
+            self,
+            no_of_rounds: int = 4,
+            key_parity: bool = False,
+            engine: FEALEngine = FEALEngine.INTEGER
+    ):
         super(FEAL, self).__init__(block_size=8, no_of_rounds=no_of_rounds)
 
-        # store key parity
+        # store key parity, which is off by default as FEAL key has no parity bits, i.e., all 8 bits of each
+        # byte are used by key schedule; it is an optional check of DES-style odd parity of each key byte
         self.key_parity = key_parity
 
         # calculate number of subkey required
         self._no_of_subkey = no_of_rounds + 8
 
+        # select implementation
+        self._engine = FEALEngine.INTEGER
+        self.set_engine(engine)
+
+        # initialize round keys as python int for integer implementation, i.e., 64-bit input whitening key,
+        # 16-bit round keys and 64-bit output whitening key
+        self._round_key_ints = None
+        self._i_round_key_ints = None
+
+    def set_engine(self, engine: FEALEngine):
+        # verify and store engine
+        FEALEngine(engine)
+        self._engine = engine
+
+    def get_engine(self) -> FEALEngine:
+        return self._engine
+
     def _validate_block_size(self):
         if self._block_size != 8:
             raise ValueError(f'{self._block_size} is not a valid block size')
 
     def _validate_key_size(self):
         try:
-            FEALKeySize(len(self._key))
-
-            # check key parity if enabled
-            if self.key_parity:
-                raise NotImplementedError
-
+            self._KEY_SIZE(len(self._key))
         except ValueError:
             raise ValueError(f'{len(self._key)} is not a valid key size')
 
+        # check for odd parity if enabled
+        if self.key_parity:
+            for k in self._key:
+                if bin(k).count('1') % 2 == 0:
+                    warnings.warn(f'FEAL key parity bit for {k:02X} is not valid', KeyParityWarning)
+                    break
+
+    def _get_key_schedule_cache_key(self) -> tuple:
+        # number of subkeys depends on number of rounds
+        return type(self), self._no_of_subkey, bytes(self._key)
+
     def _key_schedule(self):
         # calculate key size and initialize round key array
         self._key_size = len(self._key)
         self._round_key = np.zeros((self._no_of_subkey, 2), dtype=np.uint8)
 
-        # create left and right array
-        half = self._key_size >> 1
-        left = np.zeros((half,), dtype=np.uint8)
-        right = np.zeros((half,), dtype=np.uint8)
-
-        left[:] = self._key[:half]
-        right[:] = self._key[half:]
-
-        # create backup array
-        left_backup = np.zeros(left.shape, dtype=left.dtype)
-        right_backup = Utility.copy_to_numpy(right)
-
-        # compute and store each round key
-        i = 0
-        while i < self._no_of_subkey:
-            # backup right array
-            right_backup[:] = right[:]
-
-            # perform xor between left_backup and right array,
-            # and store the result in right array
-            Bitwise.xor(left_backup, right, right)
-
-            # backup left array
-            left_backup[:] = left[:]
-            self._fk(left, right)
-            self._round_key[i, :] = left[:2]
-            i += 1
-            self._round_key[i, :] = left[2:]
-            i += 1
-            right[:] = left[:]
-            left[:] = right_backup[:]
+        # (A[0], B[0]) is left key, and (KR1, KR2) is right key of FEAL-NX, which is 0 for FEAL-N
+        left, right = struct.unpack('>2I', self._key[:8].tobytes())
+        kr1, kr2 = struct.unpack('>2I', self._key[8:16].tobytes()) if self._key_size == 16 else (0, 0)
+        q = (kr1 ^ kr2, kr1, kr2)
+
+        # compute and store each round key, i.e., for r = 1, 2, ..., (N / 2) + 4; compute
+        #   D[r] = A[r-1], A[r] = B[r-1]
+        #   B[r] = fK(A[r-1], B[r-1] ^ D[r-1] ^ Q[r])
+        #   (K[2(r-1)], K[2(r-1)+1]) = B[r]
+        # where D[0] = 0, and Q[r] = KR1 ^ KR2, KR1 or KR2 for r mod 3 = 1, 2 or 0 respectively
+        _round_key_ints = []
+        d = 0
+        for r in range(self._no_of_subkey >> 1):
+            left, right, d = right, self._fk(left, right ^ d ^ q[r % 3]), left
+            _round_key_ints.extend((right >> 16, right & 0xFFFF))
+
+        self._round_key[:] = np.array(_round_key_ints, dtype='>u2').view(np.uint8).reshape(-1, 2)
+
+        # round keys K[0], ..., K[N-1], input whitening key (K[N], ..., K[N+3]) and
+        # output whitening key (K[N+4], ..., K[N+7]); decryption exchanges whitening keys
+        n = self._no_of_rounds
+        _keys = tuple(_round_key_ints[:n])
+        _k = _round_key_ints[n:]
+        _whitening_keys = (
+            ((_k[0] << 16) | _k[1], (_k[2] << 16) | _k[3]),
+            ((_k[4] << 16) | _k[5], (_k[6] << 16) | _k[7])
+        )
+        self._round_key_ints = _whitening_keys[0], _keys, _whitening_keys[1]
+        self._i_round_key_ints = _whitening_keys[1], _keys[::-1], _whitening_keys[0]
 
     def _split_lr(self, buffer: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         half = len(buffer) >> 1
 
-        # create a left array of buffer size and copy left part of buffer
-        left = np.zeros(buffer.shape, dtype=buffer.dtype)
+        # take the pre-allocated left array of buffer size and copy left part of buffer
+        left = self._get_scratch('left', buffer)
         left[:half] = buffer[:half]
+        left[half:] = 0
 
         # copy right part of buffer at the starting treating
         # as right array instead of creating new one
         buffer[:half] = buffer[half:]
-        buffer[half:] = np.zeros((half,), dtype=buffer.dtype)
+        buffer[half:] = 0
 
         return left, buffer
 
@@ -109,20 +162,95 @@ class FEAL(FeistelCipher, ABC):
         return left
 
     def _round_function(self, buffer: np.ndarray, key: np.ndarray):
-        pass
+        # f(a, b) of reference implementation on bytes, where a is first 4 bytes of buffer
+        a0, a1, a2, a3 = (int(x) for x in buffer[:4])
+        f1 = a1 ^ int(key[0]) ^ a0
+        f2 = a2 ^ int(key[1]) ^ a3
+        f1 = self._s1(f1, f2)
+        f2 = self._s0(f2, f1)
+        f0 = self._s0(a0, f1)
+        f3 = self._s1(a3, f2)
+
+        output = self._get_scratch('f', buffer)
+        output[:4] = f0, f1, f2, f3
+        output[4:] = 0
+
+        return output
 
     @staticmethod
-    def rot2(x: np.uint8) -> np.uint8:
-        return np.uint8(x << 2 | x >> 6)
+    def rot2(x: int) -> int:
+        return ((x << 2) | (x >> 6)) & 0xFF
+
+    def _s0(self, x1: int, x2: int) -> int:
+        return self.rot2((x1 + x2) & 0xFF)
+
+    def _s1(self, x1: int, x2: int) -> int:
+        return self.rot2((x1 + x2 + 1) & 0xFF)
+
+    def _fk(self, a: int, b: int) -> int:
+        # fK(a, b) on 32-bit words a and b
+        s = self._S
+        x = a ^ (a >> 8)
+        fk1 = (x >> 16) & 0xFF
+        fk2 = x & 0xFF
+        fk1 = s[fk1 + (fk2 ^ (b >> 24)) + 1]
+        fk2 = s[fk2 + (fk1 ^ ((b >> 16) & 0xFF))]
+        fk0 = s[(a >> 24) + (fk1 ^ ((b >> 8) & 0xFF))]
+        fk3 = s[(a & 0xFF) + (fk2 ^ (b & 0xFF)) + 1]
+        return (fk0 << 24) | (fk1 << 16) | (fk2 << 8) | fk3
+
+    def _int_process(self, buffer: np.ndarray, round_key_ints: tuple) -> np.ndarray:
+        # encryption and decryption are same process on (L[0], R[0]) and (R[N], L[N]) respectively,
+        # with exchanged whitening keys and reversed round keys
+        (w0, w1), keys, (v0, v1) = round_key_ints
+        s = self._S
+        left, right = struct.unpack('>2I', buffer.tobytes())
+
+        # (L[0], R[0]) = (L[0], R[0]) ^ (K[N], K[N+1], K[N+2], K[N+3]) ^ (0, L[0])
+        left ^= w0
+        right ^= w1 ^ left
+
+        for k in keys:
+            # R[r] = L[r-1] ^ f(R[r-1], K[r-1]), L[r] = R[r-1], with f inlined
+            x = right ^ (right >> 8)
+            f1 = ((x >> 16) ^ (k >> 8)) & 0xFF
+            f2 = (x ^ k) & 0xFF
+            f1 = s[f1 + f2 + 1]
+            f2 = s[f2 + f1]
+            left, right = right, left ^ (
+                (s[(right >> 24) + f1] << 24) | (f1 << 16) | (f2 << 8) | s[(right & 0xFF) + f2 + 1]
+            )
+
+        # (R[N], L[N]) = (R[N], L[N]) ^ (0, R[N]) ^ (K[N+4], K[N+5], K[N+6], K[N+7])
+        buffer[:] = np.frombuffer(struct.pack('>2I', right ^ v0, left ^ right ^ v1), dtype=np.uint8)
+
+        return buffer
+
+    def _vectorized_process(self, blocks: np.ndarray, round_key_ints: tuple) -> np.ndarray:
+        # same as _int_process, on (N, 8) blocks at once viewed as (N, 2) uint32 array
+        (w0, w1), keys, (v0, v1) = round_key_ints
+        s = self._S_ARRAY
+        words = np.ascontiguousarray(blocks).view('>u4').astype(np.uint32)
+        left, right = words[:, 0], words[:, 1]
 
-    def _s0(self, x1: np.uint8, x2: np.uint8) -> np.uint8:
-        return self.rot2(x1 + x2)
+        left ^= np.uint32(w0)
+        right ^= np.uint32(w1)
+        right ^= left
 
-    def _s1(self, x1: np.uint8, x2: np.uint8) -> np.uint8:
-        return self.rot2(x1 + x2 + 1)
+        for k in keys:
+            x = right ^ (right >> 8)
+            f1 = ((x >> 16) ^ (k >> 8)) & 0xFF
+            f2 = (x ^ k) & 0xFF
+            f1 = s[f1 + f2 + 1]
+            f2 = s[f2 + f1]
+            left ^= (s[(right >> 24) + f1] << 24) | (f1 << 16) | (f2 << 8) | s[(right & 0xFF) + f2 + 1]
+            left, right = right, left
 
-    def _fk(self, left: np.ndarray, right: np.ndarray):
-        pass
+        blocks[:] = np.stack(
+            (right ^ np.uint32(v0), left ^ right ^ np.uint32(v1)), axis=1
+        ).astype('>u4').view(np.uint8)
+
+        return blocks
 
     def _pre_processing(self, left: np.ndarray, right: np.ndarray, n: int):
         # Encryption:
@@ -172,10 +300,25 @@ class FEAL(FeistelCipher, ABC):
         left[2] ^= self._round_key[n][0]
         left[3] ^= self._round_key[n][1]
 
+    def _encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        if self._engine == FEALEngine.INTEGER and len(blocks) >= self._VECTORIZED_MIN_BLOCKS:
+            return self._vectorized_process(blocks, self._round_key_ints)
+
+        return super(FEAL, self)._encrypt_blocks(blocks)
+
+    def _decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        if self._engine == FEALEngine.INTEGER and len(blocks) >= self._VECTORIZED_MIN_BLOCKS:
+            return self._vectorized_process(blocks, self._i_round_key_ints)
+
+        return super(FEAL, self)._decrypt_blocks(blocks)
+
     def _encrypt(self, buffer: np.ndarray) -> np.ndarray:
+        if self._engine == FEALEngine.INTEGER:
+            return self._int_process(buffer, self._round_key_ints)
+
         # split the plaintext block into two equal pieces: (L[0], R[0])
         left, right = self._split_lr(buffer)
-        temp = np.zeros(right.shape, dtype=right.dtype)
+        temp = self._get_scratch('temp', right)
 
         # apply pre-processing on left and right
         self._pre_processing(left=left, right=right, n=self._no_of_rounds)
@@ -199,9 +342,12 @@ class FEAL(FeistelCipher, ABC):
         return buffer
 
     def _decrypt(self, buffer: np.ndarray) -> np.ndarray:
+        if self._engine == FEALEngine.INTEGER:
+            return self._int_process(buffer, self._i_round_key_ints)
+
         # split the plaintext block into two equal pieces: (R[n], L[n])
         right, left = self._split_lr(buffer)
-        temp = np.zeros(right.shape, dtype=right.dtype)
+        temp = self._get_scratch('temp', right)
 
         # apply pre-processing on left and right
         self._pre_processing(left=right, right=left, n=self._no_of_rounds + 4)
@@ -226,26 +372,122 @@ class FEAL(FeistelCipher, ABC):
 
 
 class FEAL4(FEAL):
-    def __init__(self):
-        super(FEAL4, self).__init__(no_of_rounds=4)
+    def __init__(self, key_parity: bool = False, engine: FEALEngine = FEALEngine.INTEGER):
+        super(FEAL4, self).__init__(no_of_rounds=4, key_parity=key_parity, engine=engine)
 
 
 class FEAL8(FEAL):
-    def __init__(self):
-        super(FEAL8, self).__init__(no_of_rounds=8)
+    def __init__(self, key_parity: bool = False, engine: FEALEngine = FEALEngine.INTEGER):
+        super(FEAL8, self).__init__(no_of_rounds=8, key_parity=key_parity, engine=engine)
 
 
 class FEALn(FEAL):
-    def __init__(self, no_of_rounds: int = 0):
-        super(FEALn, self).__init__(no_of_rounds=no_of_rounds)
+    def __init__(
+            self,
+            no_of_rounds: int = 0,
+            key_parity: bool = False,
+            engine: FEALEngine = FEALEngine.INTEGER
+    ):
+        super(FEALn, self).__init__(no_of_rounds=no_of_rounds, key_parity=key_parity, engine=engine)
 
 
 class FEALnx(FEAL):
-    def __init__(self, no_of_rounds: int = 0):
-        super(FEALnx, self).__init__(no_of_rounds=no_of_rounds)
-
-    def _validate_key_size(self):
-        try:
-            FEALXKeySize(len(self._key))
-        except ValueError:
-            raise ValueError(f'{len(self._key)} is not a valid key size')
+    _KEY_SIZE = FEALXKeySize
+
+    def __init__(
+            self,
+            no_of_rounds: int = 0,
+            key_parity: bool = False,
+            engine: FEALEngine = FEALEngine.INTEGER
+    ):
+        super(FEALnx, self).__init__(no_of_rounds=no_of_rounds, key_parity=key_parity, engine=engine)
+
+
+if __name__ == '__main__':
+    _key = '0123456789ABCDEF'
+    _input_data = '0000000000000000'
+    print('Scenario 1: FEAL-8')
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    feal = FEAL8()
+    feal.set_key(_key)
+    _output_data = feal.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != 'CEEF2C86F2490752':
+        raise RuntimeError('FEAL encryption fails')
+
+    _output_data = feal.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('FEAL decryption fails')
+
+    print('\nScenario 2: FEAL-8, Reference engine')
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    feal = FEAL8(engine=FEALEngine.REFERENCE)
+    feal.set_key(_key)
+    _output_data = feal.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != 'CEEF2C86F2490752':
+        raise RuntimeError('FEAL encryption fails')
+
+    _output_data = feal.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('FEAL decryption fails')
+
+    _key = '0123456789ABCDEF0123456789ABCDEF'
+    print('\nScenario 3: FEAL-32X')
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    feal = FEALnx(no_of_rounds=32)
+    feal.set_key(_key)
+    _output_data = feal.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != '9C9B54973DF685F8':
+        raise RuntimeError('FEAL encryption fails')
+
+    _output_data = feal.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('FEAL decryption fails')
+
+    # chosen plaintext pairs of differential cryptanalysis of FEAL-4, encrypted in batch
+    from utility import Utility
+    _key = '0123456789ABCDEF'
+    print('\nScenario 4: FEAL-4, batch of chosen plaintexts')
+    print(f'Key {_key}')
+    _input_data = Utility.copy_to_numpy(Utility.generate_random(8 * 256))
+    _input_data[8:16] = _input_data[:8] ^ np.frombuffer(bytes.fromhex('8080000080800000'), dtype=np.uint8)
+    feal = FEAL4()
+    feal.set_key(_key)
+    feal_reference = FEAL4(engine=FEALEngine.REFERENCE)
+    feal_reference.set_key(_key)
+    _output_data = feal.encrypt(_input_data)
+    for _i in range(0, len(_input_data), 8):
+        if not np.array_equal(_output_data[_i: _i + 8], feal_reference.encrypt(_input_data[_i: _i + 8])):
+            raise RuntimeError('FEAL encryption fails')
+
+    _output_data = feal.decrypt(_output_data)
+    if not np.array_equal(_output_data, _input_data):
+        raise RuntimeError('FEAL decryption fails')
+    print('Passed')
+
+    # FEAL key has no parity bits, so that random keys do not warn unless odd parity is checked on request,
+    # which is same for FEAL-N and FEAL-NX
+    print('\nScenario 5: FEAL-N and FEAL-NX, key parity')
+    for _feal, _key_length in ((FEAL4, 8), (FEAL8, 8), (lambda **kwargs: FEALn(16, **kwargs), 8),
+                               (lambda **kwargs: FEALnx(32, **kwargs), 16)):
+        with warnings.catch_warnings(record=True) as _warnings:
+            warnings.simplefilter('always')
+            for _ in range(16):
+                _feal().set_key(Utility.generate_random(_key_length))
+        if _warnings:
+            raise RuntimeError('FEAL key parity check fails')
+
+        with warnings.catch_warnings(record=True) as _warnings:
+            warnings.simplefilter('always')
+            _feal(key_parity=True).set_key('00' * _key_length)
+        if len(_warnings) != 1 or not issubclass(_warnings[0].category, KeyParityWarning):
+            raise RuntimeError('FEAL key parity check fails')
+    print('Passed')
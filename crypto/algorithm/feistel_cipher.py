@@ -14,6 +14,18 @@ class FeistelCipher(Symmetric, ABC):
     def __init__(self, block_size: int = 0, no_of_rounds: int = 0):
         super(FeistelCipher, self).__init__(block_size=block_size, no_of_rounds=no_of_rounds)
 
+        # pre-allocated scratch buffers by name, so that block processing does not allocate
+        self._scratch = {}
+
+    def _get_scratch(self, name: str, buffer: np.ndarray) -> np.ndarray:
+        # allocate scratch buffer of same shape and type as buffer on first use only
+        scratch = self._scratch.get(name)
+        if scratch is None or scratch.shape != buffer.shape or scratch.dtype != buffer.dtype:
+            scratch = np.zeros(buffer.shape, dtype=buffer.dtype)
+            self._scratch[name] = scratch
+
+        return scratch
+
     def _split_lr(self, buffer: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         raise NotImplementedError('Provide the definition of method to split the buffer into left and right')
 
@@ -26,7 +38,7 @@ class FeistelCipher(Symmetric, ABC):
     def _encrypt(self, buffer: np.ndarray) -> np.ndarray:
         # split the plaintext block into two equal pieces: (L[0], R[0])
         left, right = self._split_lr(buffer)
-        temp = np.zeros(right.shape, dtype=right.dtype)
+        temp = self._get_scratch('temp', right)
 
         # for each round i = 0, 1, ..., n; compute
         #   L[i+1] = R[i]
@@ -46,7 +58,7 @@ class FeistelCipher(Symmetric, ABC):
     def _decrypt(self, buffer: np.ndarray) -> np.ndarray:
         # split the plaintext block into two equal pieces: (R[n], L[n])
         right, left = self._split_lr(buffer)
-        temp = np.zeros(right.shape, dtype=right.dtype)
+        temp = self._get_scratch('temp', right)
 
         # for each round i = n, n-1, ..., 0; compute
         #   R[i] = L[i+1]
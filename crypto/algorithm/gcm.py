@@ -232,3 +232,21 @@ if __name__ == '__main__':
     print(f'Payload {_payload_out}')
     if _payload_out != _payload.upper():
         raise RuntimeError('AES GCM decrypt_verify fails')
+
+    print('=' * 80)
+
+    # Test Case 6 with bytes
+    print('Test Case 6: bytes')
+    aes = GCM(SymmetricAlgorithm.AES, bytes.fromhex(_key), bytes.fromhex(_iv), 60 * 8, 16,
+              bytes.fromhex(_associated_data))
+    _ciphertext_bytes, _mac_bytes = aes.generate_encrypt(bytes.fromhex(_payload), final=True)
+    if not isinstance(_ciphertext_bytes, bytes) or _ciphertext_bytes.hex().upper() != _ciphertext_ or \
+            _mac_bytes.hex().upper() != _mac_:
+        raise RuntimeError('AES GCM generate_encrypt fails')
+
+    aes = GCM(SymmetricAlgorithm.AES, bytes.fromhex(_key), bytes.fromhex(_iv), 60 * 8, 16,
+              bytes.fromhex(_associated_data))
+    _payload_out = aes.decrypt_verify(_ciphertext_bytes, _mac_bytes, final=True)
+    if not isinstance(_payload_out, bytes) or _payload_out.hex() != _payload.lower():
+        raise RuntimeError('AES GCM decrypt_verify fails')
+    print('Passed')
@@ -328,12 +328,12 @@ class GHASH:
 
     def generate(
             self,
-            input_data: Union[str, np.ndarray],
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
             final: bool = False,
             hash_: np.ndarray = None
-    ) -> Union[str, np.ndarray]:
-        # copy input to output for further calculation
-        output_data = Utility.copy_to_numpy(input_data, error_msg='Invalid plaintext')
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # input is only read, so it is used as is without copy
+        output_data = Utility.convert_to_numpy(input_data, error_msg='Invalid plaintext')
 
         if final:
             output_data = Padding(PaddingScheme.M1, self._block_size).apply_padding(output_data)
@@ -361,8 +361,8 @@ class GHASH:
                 hash_ = self._iv.copy()
 
             # return output in same format as input
-            if isinstance(input_data, str):
-                return Utility.convert_to_str(self._iv[:])
+            if not isinstance(input_data, np.ndarray):
+                return Utility.convert_to_type(hash_, input_data)
         else:
             if isinstance(input_data, str):
                 return ''
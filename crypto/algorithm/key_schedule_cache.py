@@ -0,0 +1,123 @@
+# import external library
+import numpy as np
+import threading
+
+# from import external library
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Union
+
+# from import internal library
+from utility import Utility
+
+
+class KeyScheduleCache:
+    def __init__(self, max_size: int = 1024):
+        # store maximum number of key schedules
+        self._max_size = 0
+        self.set_max_size(max_size)
+
+        # key schedules in least recently used order, i.e., the first one is evicted first
+        self._schedules = OrderedDict()
+        self._lock = threading.Lock()
+
+        # initialize statistics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def set_max_size(self, max_size: int):
+        if max_size < 0:
+            raise ValueError(f'{max_size} is not a valid cache size')
+
+        self._max_size = max_size
+
+        # evict the least recently used key schedules, if cache is shrunk
+        if hasattr(self, '_schedules'):
+            with self._lock:
+                self._evict()
+
+    def get_max_size(self) -> int:
+        return self._max_size
+
+    def _evict(self):
+        while len(self._schedules) > self._max_size:
+            self._schedules.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, cache_key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            schedule = self._schedules.get(cache_key)
+
+            if schedule is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._schedules.move_to_end(cache_key)
+
+        return schedule
+
+    def put(self, cache_key: Hashable, schedule: Dict[str, Any]):
+        if self._max_size == 0:
+            return
+
+        # cached round keys are shared across instances, so protect them from modification
+        for value in schedule.values():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+
+        with self._lock:
+            self._schedules[cache_key] = schedule
+            self._schedules.move_to_end(cache_key)
+            self._evict()
+
+    def purge(self, key: Union[str, np.ndarray] = None):
+        # remove key schedules of the given key (of any algorithm), or all key schedules if key is not passed
+        with self._lock:
+            if key is None:
+                self._schedules.clear()
+                return
+
+            _key = bytes(Utility.copy_to_numpy(key, error_msg='Invalid key'))
+            for cache_key in [cache_key for cache_key in self._schedules if cache_key[-1] == _key]:
+                del self._schedules[cache_key]
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size': len(self._schedules),
+                'max_size': self._max_size
+            }
+
+    def reset_statistics(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+# process-wide cache shared by all algorithm instances
+key_schedule_cache = KeyScheduleCache()
+
+
+if __name__ == '__main__':
+    cache = KeyScheduleCache(max_size=2)
+    cache.put(('A', b'\x00'), {'_round_key': np.zeros((2,), dtype=np.uint8)})
+    cache.put(('A', b'\x01'), {'_round_key': np.ones((2,), dtype=np.uint8)})
+    if cache.get(('A', b'\x00')) is None:
+        raise RuntimeError('KeyScheduleCache get fails')
+
+    # ('A', b'\x01') is the least recently used one
+    cache.put(('A', b'\x02'), {'_round_key': np.ones((2,), dtype=np.uint8)})
+    if cache.get(('A', b'\x01')) is not None:
+        raise RuntimeError('KeyScheduleCache eviction fails')
+
+    cache.purge('00')
+    if cache.get(('A', b'\x00')) is not None:
+        raise RuntimeError('KeyScheduleCache purge fails')
+
+    print(f'Statistics {cache.get_statistics()}')
+    if cache.get_statistics() != {'hits': 1, 'misses': 2, 'evictions': 1, 'size': 1, 'max_size': 2}:
+        raise RuntimeError('KeyScheduleCache statistics fails')
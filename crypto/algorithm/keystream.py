@@ -0,0 +1,257 @@
+# import external library
+import numpy as np
+import threading
+
+# from import external library
+from typing import Iterator, Union
+
+# from import internal library
+from bitwise import Bitwise
+from block_cipher_modes import BlockCipherConfidentialityModes
+from utility import Utility
+
+
+class Keystream:
+    def __init__(self, block_cipher, budget: int = 1 << 16):
+        # keystream of OFB, CTR or GCTR mode of a keyed block cipher with iv set, generated ahead of time
+        # up to budget bytes; iv of block cipher is advanced as keystream is generated, so once created,
+        # all data of the block cipher should be processed through keystream
+        if block_cipher.mode not in (BlockCipherConfidentialityModes.OFB, BlockCipherConfidentialityModes.CTR,
+                                     BlockCipherConfidentialityModes.GCTR):
+            raise ValueError(f'{block_cipher.mode.name} is not a valid mode for keystream')
+
+        if block_cipher._iv is None:
+            raise ValueError('IV is not set')
+
+        if budget < 0:
+            raise ValueError(f'{budget} is not a valid budget')
+
+        self._block_cipher = block_cipher
+        self._block_size = block_cipher._block_size
+
+        # round up the budget to complete blocks
+        self._budget = -(-budget // self._block_size) * self._block_size
+
+        # budget is filled in chunks, so that keystream becomes available while rest of it is generated
+        self._chunk_size = max(self._budget // 4 // self._block_size, 1) * self._block_size
+
+        # generated but unconsumed keystream is size bytes of ring buffer from head, where ring buffer has
+        # room for budget and unconsumed part of last block generated on demand
+        self._ring = np.zeros((self._budget + self._block_size,), dtype=np.uint8)
+        self._head = 0
+        self._size = 0
+
+        # lock guards ring buffer only and is held for copies, whereas generation lock serializes advancement
+        # of iv and appending, so that keystream is appended in order without blocking readers of ring buffer
+        self._lock = threading.Lock()
+        self._generation_lock = threading.Lock()
+
+        # background generation
+        self._thread = None
+        self._refill = threading.Event()
+        self._stop = threading.Event()
+
+    def _generate(self, no_of_blocks: int) -> np.ndarray:
+        block_cipher = self._block_cipher
+
+        # OFB keystream is chained, i.e., each block is encryption of previous block
+        if block_cipher.mode == BlockCipherConfidentialityModes.OFB:
+            blocks = np.zeros((no_of_blocks, self._block_size), dtype=np.uint8)
+            for block in blocks:
+                block_cipher.encrypt_into(block_cipher._iv, block_cipher._iv)
+                block[:] = block_cipher._iv
+
+            return blocks.reshape(-1)
+
+        # counter blocks are independent, so encrypt all at once
+        return block_cipher.encrypt_blocks(block_cipher._generate_counter_blocks(no_of_blocks)).reshape(-1)
+
+    def _push(self, keystream: np.ndarray):
+        # append keystream at tail of ring buffer, which has room for it; caller holds both locks
+        tail = (self._head + self._size) % len(self._ring)
+        length = min(len(keystream), len(self._ring) - tail)
+        self._ring[tail: tail + length] = keystream[:length]
+        self._ring[:len(keystream) - length] = keystream[length:]
+        self._size += len(keystream)
+
+    def _pop(self, keystream: np.ndarray):
+        # consume keystream from head of ring buffer, which holds at least as much; caller holds lock
+        length = min(len(keystream), len(self._ring) - self._head)
+        keystream[:length] = self._ring[self._head: self._head + length]
+        keystream[length:] = self._ring[:len(keystream) - length]
+        self._head = (self._head + len(keystream)) % len(self._ring)
+        self._size -= len(keystream)
+
+    def available(self) -> int:
+        # number of bytes of generated but unconsumed keystream
+        with self._lock:
+            return self._size
+
+    def fill(self, no_of_bytes: int = None):
+        # pre-generate keystream, so that available keystream is at least no_of_bytes (budget if None)
+        # but not more than budget
+        target = self._budget if no_of_bytes is None else min(no_of_bytes, self._budget)
+        with self._generation_lock:
+            while not self._stop.is_set():
+                shortfall = target - self.available()
+                if shortfall <= 0:
+                    break
+
+                # generate outside lock, as only holder of generation lock appends
+                no_of_blocks = min(shortfall, self._chunk_size) // self._block_size
+                keystream = self._generate(max(no_of_blocks, 1))
+                with self._lock:
+                    self._push(keystream)
+
+    def read(self, no_of_bytes: int) -> np.ndarray:
+        # consume no_of_bytes of keystream, of any length, generating only the shortfall
+        if no_of_bytes < 0:
+            raise ValueError(f'{no_of_bytes} is not a valid length')
+
+        keystream = np.zeros((no_of_bytes,), dtype=np.uint8)
+        with self._lock:
+            if self._size >= no_of_bytes:
+                self._pop(keystream)
+                no_of_bytes = 0
+
+        if no_of_bytes:
+            # wait for generation in progress, whose keystream comes first, then generate the shortfall
+            with self._generation_lock:
+                with self._lock:
+                    length = min(self._size, no_of_bytes)
+                    self._pop(keystream[:length])
+
+                if length < no_of_bytes:
+                    # ring buffer is empty, so unconsumed part of last block is kept there
+                    generated = self._generate(-(-(no_of_bytes - length) // self._block_size))
+                    keystream[length:] = generated[:no_of_bytes - length]
+                    with self._lock:
+                        self._push(generated[no_of_bytes - length:])
+
+        # wake up background generation once half of the budget is consumed
+        if self._thread is not None and self.available() < (self._budget >> 1):
+            self._refill.set()
+
+        return keystream
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        # keystream one block at a time
+        while True:
+            yield self.read(self._block_size)
+
+    def encrypt(
+            self,
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+            output_data: np.ndarray = None,
+            in_place: bool = False
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # xor data of any length with keystream, without padding
+        _output_data = Utility.copy_to_numpy(
+            input_data, out_data=output_data, error_msg='Invalid plaintext', in_place=in_place
+        )
+        Bitwise.xor(_output_data, self.read(len(_output_data)), _output_data)
+
+        # return output in same format as input
+        return Utility.convert_to_type(_output_data, input_data)
+
+    def decrypt(
+            self,
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+            output_data: np.ndarray = None,
+            in_place: bool = False
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # decryption is same as encryption in stream modes
+        return self.encrypt(input_data, output_data, in_place=in_place)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.fill()
+            self._refill.wait()
+            self._refill.clear()
+
+    def start(self):
+        # keep the keystream filled up to budget in a background thread
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        # stop background generation, buffered keystream stays available
+        if self._thread is not None:
+            self._stop.set()
+            self._refill.set()
+            self._thread.join()
+            self._thread = None
+            self._stop.clear()
+
+
+if __name__ == '__main__':
+    from block_cipher import BlockCipher
+    from block_cipher_modes import SymmetricAlgorithm
+    from padding import PaddingScheme
+
+    _key = '2B7E151628AED2A6ABF7158809CF4F3C'
+    _iv = 'F0F1F2F3F4F5F6F7F8F9FAFBFCFDFEFF'
+    _input_data = Utility.generate_random(1000)
+    for _mode in (BlockCipherConfidentialityModes.OFB, BlockCipherConfidentialityModes.CTR,
+                  BlockCipherConfidentialityModes.GCTR):
+        print('=' * 80)
+        print(f'Scenario: AES, {_mode.name}, messages of any length')
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+        _expected_data = aes.encrypt(_input_data, final=True)
+
+        aes = BlockCipher(SymmetricAlgorithm.AES, _mode, PaddingScheme.M1, _iv)
+        aes.set_key(_key)
+        keystream = Keystream(aes, budget=256)
+        keystream.fill()
+        if keystream.available() != 256:
+            raise RuntimeError('Keystream fill fails')
+
+        # messages of 1, 3, 5, ..., bytes
+        _output_data, _start, _length = '', 0, 1
+        while _start < len(_input_data):
+            _output_data += keystream.encrypt(_input_data[_start: _start + _length * 2])
+            _start += _length * 2
+            _length += 2
+        if _output_data != _expected_data:
+            raise RuntimeError('Keystream encryption fails')
+
+        aes.set_iv(_iv)
+        keystream = Keystream(aes, budget=256)
+        keystream.start()
+        _output_data_ = keystream.decrypt(_output_data[:602]) + keystream.decrypt(_output_data[602:])
+        keystream.stop()
+        if _output_data_ != _input_data:
+            raise RuntimeError('Keystream decryption fails')
+        print('Passed')
+
+    print('=' * 80)
+    print('Scenario: AES, CTR, read while refill is in progress')
+    aes = BlockCipher(SymmetricAlgorithm.AES, BlockCipherConfidentialityModes.CTR, PaddingScheme.M1, _iv)
+    aes.set_key(_key)
+    keystream = Keystream(aes, budget=256)
+    keystream.fill()
+
+    # refill in progress holds generation lock, and read of available keystream must not wait for it
+    _thread = threading.Thread(target=keystream.read, args=(64,))
+    with keystream._generation_lock:
+        _thread.start()
+        _thread.join(timeout=1)
+        if _thread.is_alive():
+            raise RuntimeError('Keystream read blocks on refill')
+
+    # and reads with background refill stay in order
+    aes.set_iv(_iv)
+    _expected_data = aes.encrypt(_input_data, final=True)
+    aes.set_iv(_iv)
+    keystream = Keystream(aes, budget=1 << 12)
+    keystream.start()
+    _output_data = ''.join(
+        keystream.encrypt(_input_data[_start: _start + 6]) for _start in range(0, len(_input_data), 6)
+    )
+    keystream.stop()
+    if _output_data != _expected_data:
+        raise RuntimeError('Keystream encryption fails')
+    print('Passed')
@@ -24,6 +24,7 @@ class MessageAuthenticationCode:
         self.algorithm = algorithm.value()
         self._block_size = self.algorithm.get_block_size()
         self.encrypt_one_block = self.algorithm.get_encrypt_method()
+        self.encrypt_into = self.algorithm.encrypt_into
 
         # verify and store mode
         BlockCipherAuthenticationModes(mode)
@@ -61,13 +62,13 @@ class MessageAuthenticationCode:
 
     def generate(
             self,
-            input_data: Union[str, np.ndarray],
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
             final: bool = False,
             mac: np.ndarray = None,
             mac_length: int = None
-    ) -> Union[str, np.ndarray]:
-        # copy input to output for further calculation
-        output_data = Utility.copy_to_numpy(input_data, error_msg='Invalid plaintext')
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # input is only read, so it is used as is without copy
+        output_data = Utility.convert_to_numpy(input_data, error_msg='Invalid plaintext')
 
         # append padding in final call
         if final:
@@ -86,14 +87,9 @@ class MessageAuthenticationCode:
             _end = _start + self._block_size
 
             if self.mode == BlockCipherAuthenticationModes.CBC_MAC:
+                # chaining value is encrypted into iv directly
                 Bitwise.xor(self._iv, output_data[_start: _end], self.src_temp)
-            else:
-                pass
-
-            self.encrypt_one_block(self.src_temp)
-
-            if self.mode == BlockCipherAuthenticationModes.CBC_MAC:
-                self._iv[:] = self.src_temp[:]
+                self.encrypt_into(self.src_temp, self._iv)
             else:
                 pass
 
@@ -107,10 +103,7 @@ class MessageAuthenticationCode:
                 mac[:mac_length] = self._iv[:mac_length]
 
             # return output in same format as input
-            if isinstance(input_data, str):
-                return Utility.convert_to_str(self._iv[:mac_length])
-
-            mac = self._iv[:mac_length].copy()
+            mac = Utility.convert_to_type(self._iv[:mac_length].copy(), input_data)
         else:
             if isinstance(input_data, str):
                 return ''
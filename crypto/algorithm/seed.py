@@ -1,6 +1,6 @@
 # import external library
 import numpy as np
-import warnings
+import struct
 
 # from import external library
 from enum import IntEnum
@@ -14,6 +14,14 @@ class SEEDKeySize(IntEnum):
     SEED_128_BIT_KEY = 16
 
 
+class SEEDEngine(IntEnum):
+    # numpy based implementation
+    REFERENCE = 0
+
+    # python int based implementation for single block latency
+    INTEGER = 1
+
+
 class SEED(FeistelCipher):
     _SS0 = (
         0x2989A1A8, 0x05858184, 0x16C6D2D4, 0x13C3D3D0, 0x14445054, 0x1D0D111C, 0x2C8CA0AC, 0x25052124,
@@ -159,9 +167,37 @@ class SEED(FeistelCipher):
         0x3779B99E, 0x6EF3733C, 0xDDE6E678, 0xBBCDCCF1, 0x779B99E3, 0xEF3733C6, 0xDE6E678D, 0xBCDCCF1B
     )
 
-    def __init__(self):
+    # SS tables as uint32 arrays for vectorized gathers of multi-block implementation
+    _SS_ARRAY = np.array((_SS0, _SS1, _SS2, _SS3), dtype=np.uint32)
+
+    # minimum number of blocks for which multi-block implementation is faster than integer implementation
+    _VECTORIZED_MIN_BLOCKS = 64
+
+    # attributes calculated by key schedule, which are stored in key schedule cache
+    _KEY_SCHEDULE_ATTRIBUTES = ('_key_size', '_round_key', '_round_key_ints', '_i_round_key_ints')
+
+    def __init__(self, engine: SEEDEngine = SEEDEngine.INTEGER):
         super(SEED, self).__init__(block_size=16, no_of_rounds=16)
 
+        # select implementation
+        self._engine = SEEDEngine.INTEGER
+        self.set_engine(engine)
+
+        # initialize round keys as python int for integer implementation
+        self._round_key_ints = None
+        self._i_round_key_ints = None
+
+        # pre-allocated state of reference implementation
+        self._state = np.zeros((4,), dtype=np.uint32)
+
+    def set_engine(self, engine: SEEDEngine):
+        # verify and store engine
+        SEEDEngine(engine)
+        self._engine = engine
+
+    def get_engine(self) -> SEEDEngine:
+        return self._engine
+
     def _validate_block_size(self):
         if self._block_size != 16:
             raise ValueError(f'{self._block_size} is not a valid block size')
@@ -174,34 +210,41 @@ class SEED(FeistelCipher):
 
     def _key_schedule(self):
         self._key_size = len(self._key)
-        self._round_key = np.zeros((self._no_of_rounds, 2), dtype=np.uint32)
-        key0, key1, key2, key3 = self._convert_to_state(self._key)
-
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            for i in range(self._no_of_rounds):
-                self._round_key[i, 0] = self._g(key0 + key2 - np.uint32(self._KC[i]))
-                self._round_key[i, 1] = self._g(key1 - key3 + np.uint32(self._KC[i]))
-
-                # since index starts from 0, so k1 (which will be calculated as odd) is now calculated as even
-                if i % 2:
-                    # odd round
-                    msb, lsb = key2, key3
-                    key2 = np.uint32((msb << 8) | (lsb >> 24))
-                    key3 = np.uint32((lsb << 8) | (msb >> 24))
-                else:
-                    # even round
-                    msb, lsb = key0, key1
-                    key0 = np.uint32((msb >> 8) | (lsb << 24))
-                    key1 = np.uint32((lsb >> 8) | (msb << 24))
+
+        # compute the round keys on python int, as numpy scalar arithmetic is many times slower
+        key0, key1, key2, key3 = struct.unpack('>4I', self._key.tobytes())
+        _round_key_ints = []
+
+        for i in range(self._no_of_rounds):
+            _round_key_ints.append((
+                self._g((key0 + key2 - self._KC[i]) & 0xFFFFFFFF),
+                self._g((key1 - key3 + self._KC[i]) & 0xFFFFFFFF)
+            ))
+
+            # since index starts from 0, so k1 (which will be calculated as odd) is now calculated as even
+            if i % 2:
+                # odd round
+                msb, lsb = key2, key3
+                key2 = ((msb << 8) & 0xFFFFFFFF) | (lsb >> 24)
+                key3 = ((lsb << 8) & 0xFFFFFFFF) | (msb >> 24)
+            else:
+                # even round
+                msb, lsb = key0, key1
+                key0 = (msb >> 8) | ((lsb << 24) & 0xFFFFFFFF)
+                key1 = (lsb >> 8) | ((msb << 24) & 0xFFFFFFFF)
+
+        self._round_key_ints = tuple(_round_key_ints)
+        self._i_round_key_ints = self._round_key_ints[::-1]
+        self._round_key = np.array(_round_key_ints, dtype=np.uint32)
 
     def _split_lr(self, buffer: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         half = len(buffer) >> 1
-        left = np.zeros((len(buffer),), dtype=buffer.dtype)
+        left = self._get_scratch('left', buffer)
         left[:half] = buffer[:half]
+        left[half:] = 0
 
         buffer[:half] = buffer[half:]
-        buffer[half:] = np.zeros((half,), dtype=buffer.dtype)
+        buffer[half:] = 0
 
         return left, buffer
 
@@ -214,29 +257,83 @@ class SEED(FeistelCipher):
         return left
 
     def _round_function(self, buffer: np.ndarray, key: np.ndarray):
-        r0 = buffer[0] ^ key[0]
-        r1 = buffer[1] ^ key[1]
+        # 32-bit arithmetic on python int with explicit masking, as numpy uint32 scalar arithmetic
+        # warns on overflow
+        r0 = int(buffer[0] ^ key[0])
+        r1 = int(buffer[1] ^ key[1])
 
-        # handle RuntimeWarning: overflow encountered in ubyte_scalars
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            _g_r0_xor_r1 = self._g(r0 ^ r1)
-            _gg_r0_xor_r1_and_r0 = self._g(_g_r0_xor_r1 + r0)
-            r1_prime = self._g(_gg_r0_xor_r1_and_r0 + _g_r0_xor_r1)
-            r0_prime = r1_prime + _gg_r0_xor_r1_and_r0
+        _g_r0_xor_r1 = self._g(r0 ^ r1)
+        _gg_r0_xor_r1_and_r0 = self._g((_g_r0_xor_r1 + r0) & 0xFFFFFFFF)
+        r1_prime = self._g((_gg_r0_xor_r1_and_r0 + _g_r0_xor_r1) & 0xFFFFFFFF)
+        r0_prime = (r1_prime + _gg_r0_xor_r1_and_r0) & 0xFFFFFFFF
 
         buffer[0] = r0_prime
         buffer[1] = r1_prime
 
         return buffer
 
-    def _g(self, x: np.uint32):
-        return np.uint32(
-            self._SS0[x & 0xFF] ^
-            self._SS1[(x >> 8) & 0xFF] ^
-            self._SS2[(x >> 16) & 0xFF] ^
-            self._SS3[(x >> 24) & 0xFF]
-        )
+    def _g(self, x: int) -> int:
+        return self._SS0[x & 0xFF] ^ self._SS1[(x >> 8) & 0xFF] ^ self._SS2[(x >> 16) & 0xFF] ^ self._SS3[x >> 24]
+
+    def _int_process(self, buffer: np.ndarray, round_key_ints: tuple) -> np.ndarray:
+        # convert block once into python int, i.e., the state of integer implementation
+        l0, l1, r0, r1 = struct.unpack('>4I', buffer.tobytes())
+        ss0, ss1, ss2, ss3 = self._SS0, self._SS1, self._SS2, self._SS3
+
+        for k0, k1 in round_key_ints:
+            # apply round function F on right part, with function G inlined
+            c = r0 ^ k0
+            d = c ^ r1 ^ k1
+            d = ss0[d & 0xFF] ^ ss1[(d >> 8) & 0xFF] ^ ss2[(d >> 16) & 0xFF] ^ ss3[d >> 24]
+            c = (c + d) & 0xFFFFFFFF
+            c = ss0[c & 0xFF] ^ ss1[(c >> 8) & 0xFF] ^ ss2[(c >> 16) & 0xFF] ^ ss3[c >> 24]
+            d = (c + d) & 0xFFFFFFFF
+            d = ss0[d & 0xFF] ^ ss1[(d >> 8) & 0xFF] ^ ss2[(d >> 16) & 0xFF] ^ ss3[d >> 24]
+            c = (c + d) & 0xFFFFFFFF
+
+            l0, l1, r0, r1 = r0, r1, l0 ^ c, l1 ^ d
+
+        # output is (R[n], L[n])
+        buffer[:] = np.frombuffer(struct.pack('>4I', r0, r1, l0, l1), dtype=np.uint8)
+
+        return buffer
+
+    def _vectorized_process(self, blocks: np.ndarray, round_key_ints: tuple) -> np.ndarray:
+        # same as _int_process, on (N, 16) blocks at once viewed as (N, 4) uint32 array,
+        # where uint32 array arithmetic wraps around without any warning
+        ss0, ss1, ss2, ss3 = self._SS_ARRAY
+        words = np.ascontiguousarray(blocks).view('>u4').astype(np.uint32)
+        l0, l1, r0, r1 = words[:, 0], words[:, 1], words[:, 2], words[:, 3]
+
+        for k0, k1 in round_key_ints:
+            # apply round function F on right part, with function G as vectorized SS table gathers
+            c = r0 ^ np.uint32(k0)
+            d = c ^ r1 ^ np.uint32(k1)
+            d = ss0[d & 0xFF] ^ ss1[(d >> 8) & 0xFF] ^ ss2[(d >> 16) & 0xFF] ^ ss3[d >> 24]
+            c += d
+            c = ss0[c & 0xFF] ^ ss1[(c >> 8) & 0xFF] ^ ss2[(c >> 16) & 0xFF] ^ ss3[c >> 24]
+            d += c
+            d = ss0[d & 0xFF] ^ ss1[(d >> 8) & 0xFF] ^ ss2[(d >> 16) & 0xFF] ^ ss3[d >> 24]
+            c += d
+
+            l0, l1, r0, r1 = r0, r1, l0 ^ c, l1 ^ d
+
+        # output is (R[n], L[n])
+        blocks[:] = np.stack((r0, r1, l0, l1), axis=1).astype('>u4').view(np.uint8)
+
+        return blocks
+
+    def _encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        if self._engine == SEEDEngine.INTEGER and len(blocks) >= self._VECTORIZED_MIN_BLOCKS:
+            return self._vectorized_process(blocks, self._round_key_ints)
+
+        return super(SEED, self)._encrypt_blocks(blocks)
+
+    def _decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        if self._engine == SEEDEngine.INTEGER and len(blocks) >= self._VECTORIZED_MIN_BLOCKS:
+            return self._vectorized_process(blocks, self._i_round_key_ints)
+
+        return super(SEED, self)._decrypt_blocks(blocks)
 
     @staticmethod
     def _convert_to_state(buffer: np.ndarray, state: np.ndarray = None):
@@ -260,14 +357,20 @@ class SEED(FeistelCipher):
                 buffer[i * 4 + j] = (state[i] >> (24 - j * 8)) & 0xFF
 
     def _encrypt(self, buffer: np.ndarray):
-        _buffer = np.zeros((4,), dtype=np.uint32)
+        if self._engine == SEEDEngine.INTEGER:
+            return self._int_process(buffer, self._round_key_ints)
+
+        _buffer = self._state
         self._convert_to_state(buffer, _buffer)
         super(SEED, self)._encrypt(_buffer)
         self._convert_from_state(buffer, _buffer)
         return buffer
 
     def _decrypt(self, buffer: np.ndarray):
-        _buffer = np.zeros((4,), dtype=np.uint32)
+        if self._engine == SEEDEngine.INTEGER:
+            return self._int_process(buffer, self._i_round_key_ints)
+
+        _buffer = self._state
         self._convert_to_state(buffer, _buffer)
         super(SEED, self)._decrypt(_buffer)
         self._convert_from_state(buffer, _buffer)
@@ -338,3 +441,17 @@ if __name__ == '__main__':
     print(f'Plaintext {_output_data}')
     if _output_data != _input_data:
         raise RuntimeError('SEED decryption fails')
+
+    print('Scenario 5: Reference engine')
+    seed = SEED(engine=SEEDEngine.REFERENCE)
+    seed.set_key(_key)
+    _output_data = seed.encrypt(_input_data)
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    print(f'Ciphertext {_output_data}')
+    if _output_data != '9B9B7BFCD1813CB95D0B3618F40F5122':
+        raise RuntimeError('SEED encryption fails')
+    _output_data = seed.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('SEED decryption fails')
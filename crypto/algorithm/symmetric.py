@@ -7,9 +7,13 @@ from typing import Union
 
 # from import internal library
 from utility import Utility
+from key_schedule_cache import key_schedule_cache
 
 
 class Symmetric(ABC):
+    # attributes calculated by key schedule, which are stored in key schedule cache
+    _KEY_SCHEDULE_ATTRIBUTES = ('_key_size', '_round_key')
+
     def __init__(self, block_size: int = 0, no_of_rounds: int = 0):
         # store block size and number of rounds
         self._block_size = block_size
@@ -54,8 +58,20 @@ class Symmetric(ABC):
         # validate key size
         self._validate_key_size()
 
-        # calculate and store round keys
-        self._key_schedule()
+        # reuse round keys of same algorithm and key from cache, otherwise calculate and store them
+        cache_key = self._get_key_schedule_cache_key()
+        schedule = key_schedule_cache.get(cache_key)
+
+        if schedule is None:
+            self._key_schedule()
+            key_schedule_cache.put(cache_key, {name: getattr(self, name) for name in self._KEY_SCHEDULE_ATTRIBUTES})
+        else:
+            for name, value in schedule.items():
+                setattr(self, name, value)
+
+    def _get_key_schedule_cache_key(self) -> tuple:
+        # key bytes must be the last element, which is used by purge of key schedule cache
+        return type(self), self._block_size, bytes(self._key)
 
     def _encrypt(self, buffer: np.ndarray) -> np.ndarray:
         raise NotImplementedError('Provide the definition of encrypt method')
@@ -63,49 +79,96 @@ class Symmetric(ABC):
     def _decrypt(self, buffer: np.ndarray) -> np.ndarray:
         raise NotImplementedError('Provide the definition of decrypt method')
 
-    def encrypt(self, input_data: Union[str, np.ndarray], output_data: np.ndarray = None) -> Union[str, np.ndarray]:
-        # copy input to output for further calculation
-        output_data = Utility.copy_to_numpy(input_data, out_data=output_data, error_msg='Invalid plaintext')
+    def encrypt_into(self, in_block: np.ndarray, out_block: np.ndarray) -> np.ndarray:
+        # encrypt one block into caller supplied out block, which may be the same view as in block;
+        # _encrypt works in place on the pre-allocated scratch buffers of algorithm, so nothing is allocated
+        if out_block is not in_block:
+            out_block[:] = in_block
 
-        if len(output_data) % self._block_size:
-            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes).')
+        self._encrypt(out_block)
+        return out_block
 
-        # calculate number of complete blocks
-        no_of_blocks = len(output_data) // self._block_size
+    def decrypt_into(self, in_block: np.ndarray, out_block: np.ndarray) -> np.ndarray:
+        # decrypt one block into caller supplied out block, which may be the same view as in block
+        if out_block is not in_block:
+            out_block[:] = in_block
 
-        # process each block
-        for i in range(no_of_blocks):
-            _start = i * self._block_size
-            _end = _start + self._block_size
-            output_data[_start: _end] = self._encrypt(output_data[_start: _end])
+        self._decrypt(out_block)
+        return out_block
 
-        # return output in same format as input
-        if isinstance(input_data, str):
-            return Utility.convert_to_str(output_data)
+    def _encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        # encrypt each block of (N, block size) array in place,
+        # algorithm with vectorized implementation overrides it
+        for block in blocks:
+            self._encrypt(block)
 
-        return output_data
+        return blocks
 
-    def decrypt(self, input_data: Union[str, np.ndarray], output_data: np.ndarray = None) -> Union[str, np.ndarray]:
-        # copy input to output for further calculation
-        output_data = Utility.copy_to_numpy(input_data, out_data=output_data, error_msg='Invalid ciphertext')
+    def _decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        # decrypt each block of (N, block size) array in place,
+        # algorithm with vectorized implementation overrides it
+        for block in blocks:
+            self._decrypt(block)
 
-        if len(output_data) % self._block_size:
-            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
+        return blocks
+
+    def _validate_blocks(self, blocks: np.ndarray):
+        if not isinstance(blocks, np.ndarray) or blocks.dtype != np.uint8 or blocks.ndim != 2 or \
+                blocks.shape[1] != self._block_size:
+            raise ValueError(f'Blocks are not (N, {self._block_size}) uint8 array')
+
+        if self._round_key is None:
+            raise ValueError('Key is not set')
+
+    def encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        # encrypt (N, block size) uint8 array in place, using vectorized implementation of algorithm if any
+        self._validate_blocks(blocks)
+        return self._encrypt_blocks(blocks)
+
+    def decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        # decrypt (N, block size) uint8 array in place, using vectorized implementation of algorithm if any
+        self._validate_blocks(blocks)
+        return self._decrypt_blocks(blocks)
+
+    def encrypt(
+            self,
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+            output_data: np.ndarray = None,
+            in_place: bool = False
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # copy input to output for further calculation, or process writable input in place
+        output_data = Utility.copy_to_numpy(
+            input_data, out_data=output_data, error_msg='Invalid plaintext', in_place=in_place
+        )
 
-        # calculate number of complete blocks
-        no_of_blocks = len(output_data) // self._block_size
+        if len(output_data) % self._block_size:
+            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes).')
 
-        # process each block
-        for i in range(no_of_blocks):
-            _start = i * self._block_size
-            _end = _start + self._block_size
-            output_data[_start: _end] = self._decrypt(output_data[_start: _end])
+        # process all blocks at once
+        self._encrypt_blocks(output_data.reshape(-1, self._block_size))
 
         # return output in same format as input
-        if isinstance(input_data, str):
-            output_data = Utility.convert_to_str(output_data)
+        return Utility.convert_to_type(output_data, input_data)
+
+    def decrypt(
+            self,
+            input_data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+            output_data: np.ndarray = None,
+            in_place: bool = False
+    ) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # copy input to output for further calculation, or process writable input in place
+        output_data = Utility.copy_to_numpy(
+            input_data, out_data=output_data, error_msg='Invalid ciphertext', in_place=in_place
+        )
 
-        return output_data
+        if len(output_data) % self._block_size:
+            raise ValueError(f'Input data is not multiple of block length ({self._block_size} bytes)')
+
+        # process all blocks at once
+        self._decrypt_blocks(output_data.reshape(-1, self._block_size))
+
+        # return output in same format as input
+        return Utility.convert_to_type(output_data, input_data)
 
     def get_block_size(self) -> int:
         return self._block_size
@@ -116,6 +179,12 @@ class Symmetric(ABC):
     def get_decrypt_method(self):
         return self._decrypt
 
+    def get_encrypt_blocks_method(self):
+        return self.encrypt_blocks
+
+    def get_decrypt_blocks_method(self):
+        return self.decrypt_blocks
+
 
 if __name__ == '__main__':
     try:
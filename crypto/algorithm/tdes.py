@@ -6,7 +6,7 @@ import warnings
 from enum import IntEnum
 
 # from import internal library
-from des import DES
+from des import DES, DESEngine
 from warning_crypto import DeprecatedWarning, DisallowedWarning, KeyParityWarning
 
 
@@ -16,8 +16,8 @@ class TDESKeySize(IntEnum):
 
 
 class TDES(DES):
-    def __init__(self):
-        super(TDES, self).__init__()
+    def __init__(self, engine: DESEngine = DESEngine.INTEGER):
+        super(TDES, self).__init__(engine=engine)
 
         self._operation = 0
 
@@ -51,6 +51,61 @@ class TDES(DES):
                 left = self._left_circular_rotate(left, self._KEY_SHIFT[_round])
                 self._permutation_choice2(left, right, self._round_key[operation][_round])
 
+        # store round keys as python int for integer implementation, i.e., encryption with K1, decryption with K2
+        # and encryption with K3, as flat stages with decryption order reversed ahead of time
+        _k1, _k2, _k3 = (tuple(self._convert_to_round_key_ints(k) for k in keys) for keys in self._round_key)
+        _stages = self._select_stages((_k1, _k2[::-1], _k3))
+        self._round_key_ints = tuple(self._pair_round_key_ints(keys) for keys in _stages)
+        self._i_round_key_ints = tuple(self._pair_round_key_ints(keys[::-1]) for keys in _stages[::-1])
+
+        # store round keys as bit planes for bitsliced implementation in same manner
+        _k1, _k2, _k3 = (self._convert_to_round_key_planes(keys) for keys in self._round_key)
+        self._round_key_planes = self._select_stages((_k1, _k2[::-1], _k3))
+        self._i_round_key_planes = tuple(keys[::-1] for keys in self._round_key_planes[::-1])
+
+    def _select_stages(self, stages: tuple) -> tuple:
+        # encryption with a key followed by decryption with same key (ignoring parity bits) is identity,
+        # so keying option 3 (K1 = K2 = K3) and K1 = K2 or K2 = K3 degrade to single DES
+        if self._round_key[0].tobytes() == self._round_key[1].tobytes():
+            return stages[2:]
+
+        if self._round_key[1].tobytes() == self._round_key[2].tobytes():
+            return stages[:1]
+
+        return stages
+
+    def _get_round_key_planes_of_keys(self, keys: np.ndarray) -> tuple:
+        # round keys of (M, 16) or (M, 24) keys as bit planes, i.e., three stages of (16, 48, ceil(M / 64)) planes
+        TDESKeySize(keys.shape[1])
+        index = self._get_round_key_bit_index()
+
+        # K3 is K1 for 128-bit key
+        _k1, _k2, _k3 = (
+            self._convert_to_bit_planes(keys[:, start: start + 8])[index] for start in (0, 8, (16 % keys.shape[1]))
+        )
+        return _k1, _k2[::-1], _k3
+
+    def _validate_key_size_of_keys(self, keys: np.ndarray):
+        try:
+            TDESKeySize(keys.shape[1])
+        except ValueError:
+            raise ValueError(f'{keys.shape[1]} is not a valid key size')
+
+        warnings.warn('TDES will be deprecated for all applications through 2023', DeprecatedWarning)
+        warnings.warn('TDES will be disallowed after December 31, 2023', DisallowedWarning)
+
+        # check for odd parity of all keys, and warn once
+        count = self._get_invalid_key_parity_count(keys)
+        if count:
+            warnings.warn(f'TDES key parity bit is not valid for {count} of {len(keys)} keys', KeyParityWarning)
+
+    def _key_schedule_of_keys(self, keys: np.ndarray) -> np.ndarray:
+        # round keys of K1, K2 and K3 of each key, i.e., (M, 3, 16, 8) round keys; K3 is K1 for 128-bit key
+        return np.stack([
+            super(TDES, self)._key_schedule_of_keys(keys[:, start: start + 8])
+            for start in (0, 8, (16 % keys.shape[1]))
+        ], axis=1)
+
     def get_round_key(self, round_no: int) -> np.ndarray:
         if self._round_key is None:
             raise ValueError('Key is not set')
@@ -61,6 +116,9 @@ class TDES(DES):
         self._operation = operation
 
     def _encrypt(self, buffer: np.ndarray):
+        if self._engine != DESEngine.REFERENCE:
+            return super(TDES, self)._encrypt(buffer)
+
         self._initial_permutation(buffer)
 
         self.set_operation(0)
@@ -77,6 +135,9 @@ class TDES(DES):
         return buffer
 
     def _decrypt(self, buffer: np.ndarray):
+        if self._engine != DESEngine.REFERENCE:
+            return super(TDES, self)._decrypt(buffer)
+
         self._initial_permutation(buffer)
 
         self.set_operation(2)
@@ -173,3 +234,59 @@ if __name__ == '__main__':
     print(f'Plaintext {_output_data}')
     if _output_data != _input_data:
         raise RuntimeError('TDES decryption fails')
+
+    print('Scenario 5: Reference engine')
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    tdes = TDES(engine=DESEngine.REFERENCE)
+    warnings.filterwarnings("ignore", category=DeprecatedWarning)
+    warnings.filterwarnings("ignore", category=DisallowedWarning)
+    tdes.set_key(_key)
+    warnings.resetwarnings()
+    _output_data = tdes.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != 'A1DD8F6BD298CC49':
+        raise RuntimeError('TDES encryption fails')
+
+    _output_data = tdes.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('TDES decryption fails')
+
+    print('Scenario 6: Bitsliced engine')
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    tdes = TDES(engine=DESEngine.BITSLICE)
+    warnings.filterwarnings("ignore", category=DeprecatedWarning)
+    warnings.filterwarnings("ignore", category=DisallowedWarning)
+    tdes.set_key(_key)
+    warnings.resetwarnings()
+    _output_data = tdes.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != 'A1DD8F6BD298CC49':
+        raise RuntimeError('TDES encryption fails')
+
+    _output_data = tdes.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('TDES decryption fails')
+
+    print('Scenario 7: Keying option 3 degrades to DES')
+    _key = '133457799BBCDFF1' * 3
+    _input_data = '0123456789ABCDEF'
+    print(f'Key {_key}')
+    print(f'Plaintext {_input_data}')
+    tdes = TDES()
+    warnings.filterwarnings("ignore", category=DeprecatedWarning)
+    warnings.filterwarnings("ignore", category=DisallowedWarning)
+    tdes.set_key(_key)
+    warnings.resetwarnings()
+    _output_data = tdes.encrypt(_input_data)
+    print(f'Ciphertext {_output_data}')
+    if _output_data != '85E813540F0AB405' or len(tdes._round_key_ints) != 1:
+        raise RuntimeError('TDES encryption fails')
+
+    _output_data = tdes.decrypt(_output_data)
+    print(f'Plaintext {_output_data}')
+    if _output_data != _input_data:
+        raise RuntimeError('TDES decryption fails')
@@ -9,20 +9,63 @@ from typing import Union, Tuple
 
 class Utility:
     @staticmethod
-    def copy_to_numpy(data: Union[str, np.ndarray], out_data=None, error_msg: str = 'Invalid data'):
+    def convert_to_numpy(data: Union[str, np.ndarray, bytes, bytearray, memoryview],
+                         error_msg: str = 'Invalid data') -> np.ndarray:
+        # numpy view of data without copy, i.e., numpy array as is and buffer protocol objects like bytes,
+        # bytearray, memoryview and mmap through np.frombuffer; only hex string is parsed into new array
         if isinstance(data, str):
-            _out_data = np.array(bytearray.fromhex(data))
-        elif isinstance(data, np.ndarray):
-            _out_data = np.copy(data)
-        else:
-            raise ValueError(f'{error_msg}. Only hex string and numpy array are supported')
+            return np.frombuffer(bytearray.fromhex(data), dtype=np.uint8)
 
-        if out_data is None:
-            out_data = _out_data
-        else:
-            out_data[:] = _out_data[:]
+        if isinstance(data, np.ndarray):
+            return data
+
+        try:
+            return np.frombuffer(data, dtype=np.uint8)
+        except TypeError:
+            raise ValueError(f'{error_msg}. Only hex string, numpy array and buffer protocol objects are supported')
+
+    @staticmethod
+    def copy_to_numpy(data: Union[str, np.ndarray, bytes, bytearray, memoryview], out_data=None,
+                      error_msg: str = 'Invalid data', in_place: bool = False):
+        _data = Utility.convert_to_numpy(data, error_msg=error_msg)
+
+        # copy once into passed buffer
+        if out_data is not None:
+            out_data[:] = _data[:]
+            return out_data
+
+        # parsed hex string is already a new array
+        if isinstance(data, str):
+            return _data
+
+        # process data of caller in place, without copy
+        if in_place:
+            if not _data.flags.writeable:
+                raise ValueError(f'{error_msg}. Read-only data cannot be processed in place')
+            return _data
+
+        return _data.copy()
+
+    @staticmethod
+    def convert_to_type(data: np.ndarray, like) -> Union[str, np.ndarray, bytes, bytearray, memoryview]:
+        # return data in same type as like, i.e., input of caller
+        if isinstance(like, str):
+            return Utility.convert_to_str(data)
+
+        if isinstance(like, np.ndarray):
+            return data
+
+        if isinstance(like, bytes):
+            return data.tobytes()
+
+        # writable buffer of caller processed in place is returned as is
+        if len(data) == memoryview(like).nbytes and np.may_share_memory(data, np.frombuffer(like, dtype=np.uint8)):
+            return like
+
+        if isinstance(like, bytearray):
+            return bytearray(data)
 
-        return out_data
+        return memoryview(data)
 
     @staticmethod
     def convert_to_str(data: np.ndarray) -> str:
@@ -342,13 +385,16 @@ class Utility:
         return result
 
     @staticmethod
-    def get_byte_length(a: Union[str, np.ndarray]):
+    def get_byte_length(a: Union[str, np.ndarray, bytes, bytearray, memoryview]):
         if isinstance(a, str):
             return (len(a) + 1) // 2
         elif isinstance(a, np.ndarray):
             return len(a)
         else:
-            raise NotImplementedError('Only "str" or "np.ndarray" is supported')
+            try:
+                return memoryview(a).nbytes
+            except TypeError:
+                raise NotImplementedError('Only "str", "np.ndarray" or buffer protocol object is supported')
 
     @staticmethod
     def get_bit_length(a: int) -> int: